@@ -1,31 +1,50 @@
 import os
 import csv
+import threading
 import io
+import json
+import uuid
+import base64
+import atexit
+import sqlite3
+import unicodedata
+from urllib.parse import quote
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file, g
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file, g, has_request_context, Response, stream_with_context
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, update, delete, select, or_, event, table, column, literal_column
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, selectinload, joinedload
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from markupsafe import escape
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
 # Sentiment / text utils
-from utils.text_utils import cleaned_string
-from utils.sentiment import analyze_sentiment
-
-# spaCy + regex for aspect extraction
-import spacy, re
+from utils.text_utils import cleaned_string, nltk_stops
+from utils.sentiment import analyze_sentiment, analyze_sentiment_batch, inference_cache_stats, batching_stats, inference_queue_depth, warm_up as warm_up_sentiment, MODEL_VERSION
+from utils.csv_stream import iter_csv_rows
+
+# spaCy (shared model) for aspect extraction, stored offsets for highlighting
+from utils.nlp import parse, parse_many
+from utils.aspects import AspectMatcher
+from utils.highlight import highlight_aspects
+from utils.report_cache import ReportCache
+from utils.stats_sampler import StatsSampler, file_size_mb
+from utils.metrics import RequestMetrics
+from utils.log_writer import BufferedWriter
 from collections import defaultdict
-import pandas as pd
 
 # System monitoring imports
 import time
-import psutil
 import random
 
-nlp = spacy.load("en_core_web_sm")
-
 db = SQLAlchemy()
 
 # Define the upload folder
@@ -62,14 +81,18 @@ class User(db.Model):
 
 
 class Review(db.Model):
+    __table_args__ = (
+        db.Index("ix_review_user_id_created_at", "user_id", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"))
     text = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer, default=0)
     source = db.Column(db.String(50), default="manual")
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
-    sentiment_label = db.Column(db.String(20))
+    sentiment_label = db.Column(db.String(20), index=True)
     sentiment_score = db.Column(db.Float)
 
     original_text = db.Column(db.Text)
@@ -101,9 +124,83 @@ class SystemLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     event_type = db.Column(db.String(50), nullable=False) 
     message = db.Column(db.String(255), nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     details = db.Column(db.Text) 
 
+# --- Review Aspect Result Model ---
+# Per-review aspect sentiment, computed once at ingest so the dashboards
+# only ever read it back instead of re-running spaCy and the transformer.
+class ReviewAspect(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    review_id = db.Column(db.Integer, db.ForeignKey('review.id'), nullable=False, index=True)
+    aspect = db.Column(db.String(255), nullable=False)
+    label = db.Column(db.String(20), nullable=False)
+    score = db.Column(db.Float)
+    model_version = db.Column(db.String(100))
+    # JSON list of [start_char, end_char] occurrences in the review text, for highlighting
+    spans = db.Column(db.Text)
+    review = db.relationship('Review', backref=db.backref('aspect_results', lazy=True, cascade='all, delete-orphan'))
+
+# --- Sentiment Rollup Models ---
+# Materialized per-day counts maintained as reviews are inserted, so
+# dashboards and reports aggregate a few rows per day instead of every review.
+class SentimentRollup(db.Model):
+    user_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    label = db.Column(db.String(20), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+class AspectRollup(db.Model):
+    user_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    aspect = db.Column(db.String(255), primary_key=True)
+    label = db.Column(db.String(20), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+# Counter bumped in the same transaction as every rollup change; cached
+# reports are keyed on it so checking freshness is a primary-key lookup
+class RollupVersion(db.Model):
+    scope = db.Column(db.Integer, primary_key=True)  # user id, or 0 for system-wide
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# --- CSV Ingest Job Model ---
+# Uploaded CSVs are processed in the background; the job row tracks progress
+# so it can be polled and resumed (rows_processed is committed with each chunk).
+class IngestJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))  # default owner of the rows
+    admin_id = db.Column(db.Integer, db.ForeignKey('admin.id'))  # set for admin uploads (rows carry usernames)
+    filename = db.Column(db.String(255))
+    file_path = db.Column(db.String(500), nullable=False)
+    status = db.Column(db.String(20), default="queued")  # queued / running / completed / failed
+    rows_processed = db.Column(db.Integer, default=0)
+    reviews_added = db.Column(db.Integer, default=0)
+    error_count = db.Column(db.Integer, default=0)
+    errors = db.Column(db.Text)  # JSON list of the most recent error messages
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # refreshed by the worker after every chunk
+
+    def to_dict(self):
+        end = self.finished_at or datetime.utcnow()
+        elapsed = (end - self.started_at).total_seconds() if self.started_at else 0
+        return {
+            "id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "rows_done": self.rows_processed or 0,
+            "reviews_added": self.reviews_added or 0,
+            "rows_per_second": round((self.rows_processed or 0) / elapsed, 2) if elapsed > 0 else 0,
+            "error_count": self.error_count or 0,
+            "errors": json.loads(self.errors) if self.errors else [],
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
 # --- Model Feedback Model ---
 class ModelFeedback(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -135,47 +232,246 @@ INSTANCE_DIR = os.path.join(BASE_DIR, "instance")
 os.makedirs(INSTANCE_DIR, exist_ok=True)
 os.makedirs(os.path.join(BASE_DIR, UPLOAD_FOLDER), exist_ok=True) # Ensure upload folder exists
 
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(INSTANCE_DIR, "reviews.db")
+DATABASE_PATH = os.environ.get("DATABASE_PATH", os.path.join(INSTANCE_DIR, "reviews.db"))
+app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + DATABASE_PATH
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# Background CSV ingestion
+INGEST_DIR = os.path.join(BASE_DIR, UPLOAD_FOLDER, "ingest")
+os.makedirs(INGEST_DIR, exist_ok=True)
+app.config["INGEST_WORKERS"] = int(os.environ.get("INGEST_WORKERS", 2))
+# Rows per bulk INSERT / commit; a failing chunk never rolls back earlier ones
+app.config["INGEST_CHUNK_SIZE"] = int(os.environ.get("INGEST_CHUNK_SIZE", 500))
+# A running job with no heartbeat for this long was interrupted and is requeued
+app.config["INGEST_JOB_STALE_AFTER"] = int(os.environ.get("INGEST_JOB_STALE_AFTER", 900))
+# Rendered reports (see the report cache section)
+REPORT_CACHE_DIR = os.environ.get("REPORT_CACHE_DIR", os.path.join(INSTANCE_DIR, "report_cache"))
+app.config["REPORT_CACHE_MAX_AGE"] = int(os.environ.get("REPORT_CACHE_MAX_AGE", 7 * 24 * 3600))
+app.config["REPORT_CACHE_MAX_BYTES"] = int(os.environ.get("REPORT_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+app.config["REPORT_REFRESH_INTERVAL"] = int(os.environ.get("REPORT_REFRESH_INTERVAL", 300))
+report_cache = ReportCache(
+    REPORT_CACHE_DIR,
+    max_age=app.config["REPORT_CACHE_MAX_AGE"],
+    max_bytes=app.config["REPORT_CACHE_MAX_BYTES"]
+)
+
+# Background server stats sampling for the monitoring tab
+app.config["STATS_SAMPLE_INTERVAL"] = float(os.environ.get("STATS_SAMPLE_INTERVAL", 5))
+app.config["STATS_HISTORY_POINTS"] = int(os.environ.get("STATS_HISTORY_POINTS", 720))
+
+# SystemLog events are queued and group-committed by a background writer;
+# rows past the retention age or beyond the row cap are compacted away
+app.config["SYSTEM_LOG_QUEUE_SIZE"] = int(os.environ.get("SYSTEM_LOG_QUEUE_SIZE", 10000))
+app.config["SYSTEM_LOG_BATCH_SIZE"] = int(os.environ.get("SYSTEM_LOG_BATCH_SIZE", 200))
+app.config["SYSTEM_LOG_FLUSH_INTERVAL"] = float(os.environ.get("SYSTEM_LOG_FLUSH_INTERVAL", 1.0))
+app.config["SYSTEM_LOG_RETENTION_DAYS"] = int(os.environ.get("SYSTEM_LOG_RETENTION_DAYS", 30))
+app.config["SYSTEM_LOG_MAX_ROWS"] = int(os.environ.get("SYSTEM_LOG_MAX_ROWS", 100000))
+app.config["SYSTEM_LOG_COMPACT_INTERVAL"] = int(os.environ.get("SYSTEM_LOG_COMPACT_INTERVAL", 3600))
+
+# How often each process checks AspectCategory for changes made by other workers
+app.config["ASPECT_MATCHER_CHECK_INTERVAL"] = float(os.environ.get("ASPECT_MATCHER_CHECK_INTERVAL", 30))
+
+# Load spaCy/transformers in the background once the process starts serving,
+# instead of inside the first request that needs them
+app.config["WARM_UP_MODELS"] = os.environ.get("WARM_UP_MODELS", "1") == "1"
+ingest_executor = ThreadPoolExecutor(max_workers=app.config["INGEST_WORKERS"], thread_name_prefix="ingest")
+
 db.init_app(app)
-migrate = Migrate(app, db, render_as_batch=True)
+def include_object(object, name, type_, reflected, compare_to):
+    # The FTS5 index and its shadow tables are managed by hand, not by autogenerate
+    return not (type_ == "table" and name.startswith("review_fts"))
+
+migrate = Migrate(app, db, render_as_batch=True, include_object=include_object)
+
+# Maximum SQL statements a single GET to these endpoints may issue (their
+# POST branches are writes, whose cost depends on what was submitted).
+# Exceeding a budget raises under TESTING (so tests fail) and logs a warning otherwise.
+# Set to the measured counts, so a single extra per-row query trips them.
+app.config["QUERY_BUDGETS"] = {
+    "dashboard": 5,
+    "admin_dashboard": 11,
+    "list_user_reviews": 1,
+    "list_admin_reviews": 1,
+    "get_review_details": 2,
+    "search_reviews_api": 1,
+}
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+@event.listens_for(Engine, "connect")
+def enable_sqlite_wal(dbapi_connection, connection_record):
+    # WAL lets readers (e.g. a long streamed export) run alongside a writer
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_statements(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.query_count = g.get("query_count", 0) + 1
+
+# Per-endpoint latency/count/in-flight/statement metrics, served at /metrics
+request_metrics = RequestMetrics()
 
 @app.before_request
 def set_globals():
     # Make UPLOAD_FOLDER accessible in Jinja templates (for file paths)
     g.upload_folder = UPLOAD_FOLDER
+    g.query_count = 0
+    g.request_started = time.perf_counter()
+    request_metrics.started(request.endpoint or "unmatched")
+
+@app.before_request
+def start_background_work():
+    # Whatever server runs the app, the process that handles requests warms up
+    # the models, resumes interrupted ingest jobs and keeps the cached reports fresh
+    ensure_models_warming_up()
+    ensure_ingest_resumed()
+    ensure_report_refresher_started()
+
+def record_request_metrics(status):
+    if g.get("request_started") is None or g.get("metrics_recorded"):
+        return
+    g.metrics_recorded = True
+    request_metrics.finished(
+        request.endpoint or "unmatched",
+        request.method,
+        status,
+        time.perf_counter() - g.request_started,
+        g.get("query_count", 0)
+    )
+
+@app.after_request
+def finish_request_metrics(response):
+    record_request_metrics(response.status_code)
+    return response
+
+@app.teardown_request
+def finish_failed_request_metrics(exc):
+    # after_request doesn't run when a view raises
+    record_request_metrics(500)
+
+@app.after_request
+def check_query_budget(response):
+    query_count = g.get("query_count", 0)
+    if app.debug or app.testing:
+        response.headers["X-Query-Count"] = str(query_count)
+    budget = app.config["QUERY_BUDGETS"].get(request.endpoint) if request.method == "GET" else None
+    if budget is not None and query_count > budget:
+        message = f"{request.endpoint} issued {query_count} SQL statements (budget {budget})"
+        if app.testing:
+            raise QueryBudgetExceeded(message)
+        app.logger.warning(message)
+    return response
 
 # --- Utility functions ---
-def extract_aspects(text):
-    predefined_aspects = [ac.name for ac in AspectCategory.query.all()]
-    found_aspects = []
-    text_lower = text.lower()
-    
-    for asp in predefined_aspects:
-        if re.search(r'\b' + re.escape(asp.lower()) + r'\b', text_lower):
-            found_aspects.append(asp)
-    
-    if not found_aspects:
-        doc = nlp(text)
-        found_aspects = [chunk.text.lower().strip() for chunk in doc.noun_chunks if len(chunk.text) > 2]
-    
-    return list(set(found_aspects))
-
-def analyze_aspect_sentiment(reviews):
-    aspect_counts = defaultdict(lambda: {'positive': 0, 'negative': 0, 'neutral': 0, 'scores': []})
-    for review in reviews:
-        aspects = extract_aspects(review.text)
-        for asp in aspects:
-            sent = analyze_sentiment(review.text)
-            label = sent["label"].lower()
-            if label not in ["positive", "negative", "neutral"]:
-                label = "neutral"
-            aspect_counts[asp][label] += 1
-            aspect_counts[asp]['scores'].append(sent["score"])
+# Compiled matcher over the AspectCategory table. The category admin routes
+# may run in another worker process, so each process re-reads the category
+# names at most every ASPECT_MATCHER_CHECK_INTERVAL seconds and recompiles
+# only when they changed.
+_aspect_matcher = None
+_aspect_matcher_names = None
+_aspect_matcher_checked = float("-inf")
+_aspect_matcher_lock = threading.Lock()
+
+def get_aspect_matcher():
+    global _aspect_matcher, _aspect_matcher_names, _aspect_matcher_checked
+    interval = app.config["ASPECT_MATCHER_CHECK_INTERVAL"]
+    if _aspect_matcher is not None and time.monotonic() - _aspect_matcher_checked < interval:
+        return _aspect_matcher
+    with _aspect_matcher_lock:
+        if _aspect_matcher is None or time.monotonic() - _aspect_matcher_checked >= interval:
+            names = tuple(db.session.scalars(select(AspectCategory.name).order_by(AspectCategory.id)))
+            if names != _aspect_matcher_names:
+                _aspect_matcher = AspectMatcher(list(names))
+                _aspect_matcher_names = names
+            _aspect_matcher_checked = time.monotonic()
+        return _aspect_matcher
+
+def invalidate_aspect_matcher():
+    """Recheck the categories on next use in this process (others catch up within the interval)."""
+    global _aspect_matcher_checked
+    _aspect_matcher_checked = float("-inf")
+
+def warm_up_models():
+    """Load the NLP models and the aspect matcher ahead of the first request."""
+    started = time.time()
+    parse("Warm-up.")
+    nltk_stops()
+    warm_up_sentiment()
+    with app.app_context():
+        get_aspect_matcher()
+    app.logger.info("Models warmed up in %.2f seconds.", time.time() - started)
+
+_model_warm_up = None
+_model_warm_up_lock = threading.Lock()
+
+def ensure_models_warming_up():
+    """With WARM_UP_MODELS, start loading the models in the background once per process."""
+    global _model_warm_up
+    if not app.config["WARM_UP_MODELS"]:
+        return
+    with _model_warm_up_lock:
+        if _model_warm_up is None:
+            _model_warm_up = threading.Thread(target=_warm_up_models_in_background, name="model-warm-up", daemon=True)
+            _model_warm_up.start()
+
+def _warm_up_models_in_background():
+    try:
+        warm_up_models()
+    except Exception:
+        app.logger.exception("Model warm-up failed")
+
+def extract_aspect_spans(text, doc=None):
+    """Map each aspect found in the text to its [start_char, end_char] occurrences."""
+    if doc is None:
+        doc = parse(text)
+    found = [(name, start, end) for name, start, end in get_aspect_matcher().find(doc)]
+
+    if not found:
+        found = [
+            (chunk.text.lower().strip(), chunk.start_char, chunk.end_char)
+            for chunk in doc.noun_chunks if len(chunk.text) > 2
+        ]
+
+    spans = {}
+    for name, start, end in found:
+        spans.setdefault(name, []).append([start, end])
+    return spans
+
+def extract_aspects(text, doc=None):
+    return list(extract_aspect_spans(text, doc))
+
+def analyze_aspect_sentiment(user_id=None):
+    """
+    Aggregate aspect sentiment (all reviews, or one user's) into per-aspect
+    counts and mean confidence. This reads the AspectRollup table, so its
+    cost depends on the number of distinct (day, aspect, label) rows, not on
+    the number of reviews, and it never invokes a model.
+    """
+    query = db.session.query(
+        AspectRollup.aspect,
+        AspectRollup.label,
+        db.func.sum(AspectRollup.total),
+        db.func.sum(AspectRollup.score_sum)
+    )
+    if user_id is not None:
+        query = query.filter(AspectRollup.user_id == user_id)
+    query = query.group_by(AspectRollup.aspect, AspectRollup.label)
+
+    aspect_counts = defaultdict(lambda: {'positive': 0, 'negative': 0, 'neutral': 0, 'score_sum': 0.0})
+    for asp, label, count, score_sum in query:
+        label = (label or "").lower()
+        if label not in ["positive", "negative", "neutral"]:
+            label = "neutral"
+        aspect_counts[asp][label] += count
+        aspect_counts[asp]['score_sum'] += score_sum
     final = []
     for asp, counts in aspect_counts.items():
-        avg_conf = sum(counts['scores']) / len(counts['scores']) if counts['scores'] else 0
+        mentions = counts['positive'] + counts['negative'] + counts['neutral']
+        avg_conf = counts['score_sum'] / mentions if mentions else 0
         label = max(['positive', 'negative', 'neutral'], key=lambda x: counts[x])
         final.append({
             "aspect": asp,
@@ -187,6 +483,325 @@ def analyze_aspect_sentiment(reviews):
         })
     return final
 
+def _upsert_rollup(model, key_columns, deltas):
+    """Add (total, score_sum) deltas to rollup rows, creating missing ones."""
+    if not deltas:
+        return
+    table = model.__table__
+    dialect = db.session.get_bind().dialect.name
+    stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={
+            "total": table.c.total + stmt.excluded.total,
+            "score_sum": table.c.score_sum + stmt.excluded.score_sum
+        }
+    )
+    db.session.execute(stmt, [
+        dict(zip(key_columns, key), total=total, score_sum=score_sum)
+        for key, (total, score_sum) in deltas.items()
+    ])
+
+SYSTEM_SCOPE = 0
+# Rollup owner for reviews whose user was deleted (no User has id 0), and the
+# label bucket for reviews without a sentiment, so rollup totals count every review
+ORPHANED_USER_ID = 0
+UNLABELLED = "unlabelled"
+
+def bump_rollup_versions(user_ids):
+    """Advance the data version of these users' reports and of the system reports."""
+    table = RollupVersion.__table__
+    dialect = db.session.get_bind().dialect.name
+    stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+    stmt = stmt.on_conflict_do_update(index_elements=["scope"], set_={"version": table.c.version + 1})
+    db.session.execute(stmt, [{"scope": scope, "version": 1} for scope in sorted({SYSTEM_SCOPE, *user_ids})])
+
+def update_rollups(entries, sign=1):
+    """
+    Fold reviews into the rollup tables (sign=-1 removes them again).
+    Each entry is a dict with user_id, created_at, sentiment_label,
+    sentiment_score and aspects (list of {aspect, label, score}); set
+    aspects_only=True to update only the aspect rollup. Reviews without a
+    user or a sentiment are counted under ORPHANED_USER_ID / UNLABELLED.
+    """
+    if not entries:
+        return
+    sentiment_deltas = defaultdict(lambda: [0, 0.0])
+    aspect_deltas = defaultdict(lambda: [0, 0.0])
+    user_ids = {entry["user_id"] for entry in entries if entry["user_id"] is not None}
+    mark_reports_stale(user_ids)
+    bump_rollup_versions(user_ids)
+    for entry in entries:
+        user_id = entry["user_id"] if entry["user_id"] is not None else ORPHANED_USER_ID
+        day = (entry["created_at"] or datetime.utcnow()).date()
+        if not entry.get("aspects_only"):
+            delta = sentiment_deltas[(user_id, day, (entry["sentiment_label"] or UNLABELLED).lower())]
+            delta[0] += sign
+            delta[1] += sign * (entry["sentiment_score"] or 0.0)
+        for a in entry.get("aspects", []):
+            delta = aspect_deltas[(user_id, day, a["aspect"], a["label"].lower())]
+            delta[0] += sign
+            delta[1] += sign * (a["score"] or 0.0)
+    _upsert_rollup(SentimentRollup, ["user_id", "day", "label"], sentiment_deltas)
+    _upsert_rollup(AspectRollup, ["user_id", "day", "aspect", "label"], aspect_deltas)
+
+def move_rollups(from_user_id, to_user_id):
+    """Fold one user's rollup rows into another owner's."""
+    for model, key_columns in ((SentimentRollup, ["user_id", "day", "label"]),
+                               (AspectRollup, ["user_id", "day", "aspect", "label"])):
+        rows = model.query.filter_by(user_id=from_user_id).all()
+        _upsert_rollup(model, key_columns, {
+            (to_user_id, *(getattr(row, c) for c in key_columns[1:])): (row.total, row.score_sum) for row in rows
+        })
+        model.query.filter_by(user_id=from_user_id).delete()
+
+def rollup_entry(review, aspects=None):
+    return {
+        "user_id": review.user_id,
+        "created_at": review.created_at,
+        "sentiment_label": review.sentiment_label,
+        "sentiment_score": review.sentiment_score,
+        "aspects": aspects if aspects is not None else stored_aspects(review)
+    }
+
+def rebuild_rollups():
+    """Recompute both rollup tables from the review and review_aspect tables."""
+    SentimentRollup.query.delete()
+    AspectRollup.query.delete()
+    bump_rollup_versions(db.session.scalars(select(RollupVersion.scope)).all())
+    day = db.func.date(Review.created_at)
+    owner = db.func.coalesce(Review.user_id, ORPHANED_USER_ID)
+    label = db.func.coalesce(db.func.lower(Review.sentiment_label), UNLABELLED)
+    sentiment_rows = db.session.query(
+        owner, day, label,
+        db.func.count(Review.id), db.func.coalesce(db.func.sum(Review.sentiment_score), 0.0)
+    ).group_by(owner, day, label)
+    _upsert_rollup(SentimentRollup, ["user_id", "day", "label"], {
+        (user_id, _as_date(d), label): (total, score_sum) for user_id, d, label, total, score_sum in sentiment_rows
+    })
+    aspect_rows = db.session.query(
+        owner, day, ReviewAspect.aspect, db.func.lower(ReviewAspect.label),
+        db.func.count(ReviewAspect.id), db.func.coalesce(db.func.sum(ReviewAspect.score), 0.0)
+    ).join(Review, ReviewAspect.review_id == Review.id).group_by(
+        owner, day, ReviewAspect.aspect, db.func.lower(ReviewAspect.label)
+    )
+    _upsert_rollup(AspectRollup, ["user_id", "day", "aspect", "label"], {
+        (user_id, _as_date(d), aspect, label): (total, score_sum) for user_id, d, aspect, label, total, score_sum in aspect_rows
+    })
+
+def _as_date(value):
+    # SQLite returns date() as an ISO string
+    return datetime.strptime(value, "%Y-%m-%d").date() if isinstance(value, str) else value
+
+def rollup_sentiment_counts(user_id=None):
+    """Review counts per sentiment label, from the rollup table."""
+    query = db.session.query(SentimentRollup.label, db.func.sum(SentimentRollup.total))
+    if user_id is not None:
+        query = query.filter(SentimentRollup.user_id == user_id)
+    counts = {"positive": 0, "negative": 0, "neutral": 0}
+    for label, total in query.group_by(SentimentRollup.label):
+        if label in counts:
+            counts[label] += int(total or 0)
+    return counts
+
+def rollup_review_count(user_id=None):
+    """Number of reviews (optionally one user's), from the rollup table."""
+    query = db.session.query(db.func.coalesce(db.func.sum(SentimentRollup.total), 0))
+    if user_id is not None:
+        query = query.filter(SentimentRollup.user_id == user_id)
+    return int(query.scalar())
+
+def rollup_most_active_users(limit=10):
+    """Top users by review count as (username, review_count) rows, from the rollup table."""
+    review_count = db.func.sum(SentimentRollup.total).label("review_count")
+    return db.session.query(User.username, review_count).join(
+        SentimentRollup, SentimentRollup.user_id == User.id
+    ).group_by(User.id).having(review_count > 0).order_by(db.desc("review_count")).limit(limit).all()
+
+def rollup_user_review_stats():
+    """Per-user review count and last review day, from the rollup table."""
+    query = db.session.query(
+        SentimentRollup.user_id, db.func.sum(SentimentRollup.total), db.func.max(SentimentRollup.day)
+    ).filter(SentimentRollup.total > 0).group_by(SentimentRollup.user_id)
+    return {
+        user_id: {"count": int(total), "last_review": _as_date(last_day)}
+        for user_id, total, last_day in query
+    }
+
+def rollup_sentiment_trends(user_id=None):
+    """Per-day positive/negative/neutral series for the trend charts."""
+    query = db.session.query(SentimentRollup.day, SentimentRollup.label, db.func.sum(SentimentRollup.total))
+    if user_id is not None:
+        query = query.filter(SentimentRollup.user_id == user_id)
+    by_day = defaultdict(lambda: {"positive": 0, "negative": 0, "neutral": 0})
+    for day, label, total in query.group_by(SentimentRollup.day, SentimentRollup.label):
+        if label in by_day[day]:
+            by_day[day][label] += int(total or 0)
+    days = sorted(by_day)
+    return (
+        [d.strftime("%Y-%m-%d") for d in days],
+        [by_day[d]["positive"] for d in days],
+        [by_day[d]["negative"] for d in days],
+        [by_day[d]["neutral"] for d in days]
+    )
+
+def rollup_date_range(user_id=None):
+    """First and last day with reviews, or (None, None)."""
+    query = db.session.query(db.func.min(SentimentRollup.day), db.func.max(SentimentRollup.day))
+    if user_id is not None:
+        query = query.filter(SentimentRollup.user_id == user_id)
+    return query.one()
+
+def review_window_counts(user_id=None):
+    """
+    Reviews created in the last 24h / 7 days / 30 days, as conditional
+    counts in one query over the indexed created_at column.
+    """
+    now = datetime.utcnow()
+    day_ago, week_ago, month_ago = now - timedelta(days=1), now - timedelta(weeks=1), now - timedelta(days=30)
+    query = db.session.query(
+        db.func.count(db.case((Review.created_at >= day_ago, Review.id))),
+        db.func.count(db.case((Review.created_at >= week_ago, Review.id))),
+        db.func.count(Review.id)
+    ).filter(Review.created_at >= month_ago)
+    if user_id is not None:
+        query = query.filter(Review.user_id == user_id)
+    today, week, month = query.one()
+    return {"today": today, "week": week, "month": month}
+
+REVIEW_PAGE_SIZE = 20
+MAX_REVIEW_PAGE_SIZE = 100
+
+def encode_review_cursor(review):
+    raw = f"{review.created_at.isoformat()}|{review.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_review_cursor(cursor):
+    """Return (created_at, id) from a cursor; raises ValueError if malformed."""
+    try:
+        created_at, review_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(review_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+def paginate_reviews(query, cursor=None, limit=REVIEW_PAGE_SIZE):
+    """
+    Keyset page of reviews, newest first by (created_at, id). Returns the
+    page and the cursor for the next one (None on the last page), so the
+    cost depends on the page size only, never on how deep the page is.
+    """
+    if cursor:
+        created_at, review_id = decode_review_cursor(cursor)
+        query = query.filter(db.tuple_(Review.created_at, Review.id) < (created_at, review_id))
+    rows = query.order_by(Review.created_at.desc(), Review.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_review_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def page_size_arg():
+    return max(1, min(request.args.get("limit", REVIEW_PAGE_SIZE, type=int), MAX_REVIEW_PAGE_SIZE))
+
+# --- Full-text search (SQLite FTS5) ---
+# review_fts is an external-content index over review.text/cleaned kept in
+# sync by triggers; migration e4b7c1d9a2f6 creates it, ensure_review_fts()
+# covers databases built with db.create_all().
+REVIEW_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS review_fts USING fts5("
+    "text, cleaned, content='review', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS review_fts_ai AFTER INSERT ON review BEGIN "
+    "INSERT INTO review_fts(rowid, text, cleaned) VALUES (new.id, new.text, new.cleaned); END",
+    "CREATE TRIGGER IF NOT EXISTS review_fts_ad AFTER DELETE ON review BEGIN "
+    "INSERT INTO review_fts(review_fts, rowid, text, cleaned) VALUES ('delete', old.id, old.text, old.cleaned); END",
+    "CREATE TRIGGER IF NOT EXISTS review_fts_au AFTER UPDATE OF text, cleaned ON review BEGIN "
+    "INSERT INTO review_fts(review_fts, rowid, text, cleaned) VALUES ('delete', old.id, old.text, old.cleaned); "
+    "INSERT INTO review_fts(rowid, text, cleaned) VALUES (new.id, new.text, new.cleaned); END",
+]
+review_fts = table("review_fts", column("rowid"))
+# Private-use characters mark matches in snippet() output so the review
+# text can be HTML-escaped before they become <mark> tags
+FTS_MARK_START, FTS_MARK_END = "\ue000", "\ue001"
+
+def ensure_review_fts(rebuild=False):
+    """Create the FTS index and triggers if missing (indexing existing reviews), or rebuild it."""
+    if db.engine.dialect.name != "sqlite":
+        return
+    with db.engine.begin() as conn:
+        exists = conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'review_fts'").first()
+        for ddl in REVIEW_FTS_DDL:
+            conn.exec_driver_sql(ddl)
+        if rebuild or not exists:
+            conn.exec_driver_sql("INSERT INTO review_fts(review_fts) VALUES ('rebuild')")
+
+def fts_match_query(q):
+    """Quote each search term so user input can't trip FTS5 query syntax; a trailing * keeps prefix search."""
+    terms = []
+    for term in q.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return " ".join(terms)
+
+def parse_date_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid {name} date, expected YYYY-MM-DD")
+
+def search_reviews(q, user_id=None, sentiment=None, aspect=None, date_from=None, date_to=None,
+                   limit=REVIEW_PAGE_SIZE, offset=0):
+    """
+    BM25-ranked review search (text matches weigh twice the cleaned/lemmatized
+    text). Returns (page of (review, snippet_html), next offset or None).
+    """
+    match = fts_match_query(q)
+    if not match:
+        raise ValueError("Search query is empty")
+    fts = literal_column("review_fts")
+    snippet = db.func.snippet(fts, 0, FTS_MARK_START, FTS_MARK_END, "…", 16)
+    query = (
+        db.session.query(Review, snippet)
+        .join(review_fts, review_fts.c.rowid == Review.id)
+        .filter(fts.op("MATCH")(match))
+        .options(joinedload(Review.user))
+    )
+    if user_id is not None:
+        query = query.filter(Review.user_id == user_id)
+    if sentiment:
+        query = query.filter(Review.sentiment_label == sentiment.lower())
+    if aspect:
+        query = query.filter(Review.aspect_results.any(db.func.lower(ReviewAspect.aspect) == aspect.lower()))
+    if date_from:
+        query = query.filter(Review.created_at >= date_from)
+    if date_to:
+        query = query.filter(Review.created_at < date_to + timedelta(days=1))
+    rows = query.order_by(db.func.bm25(fts, 2.0, 1.0), Review.id).limit(limit + 1).offset(offset).all()
+    page = [
+        (review, str(escape(snip)).replace(FTS_MARK_START, "<mark>").replace(FTS_MARK_END, "</mark>"))
+        for review, snip in rows[:limit]
+    ]
+    return page, offset + limit if len(rows) > limit else None
+
+def review_summary(review):
+    """Lightweight card/row data; aspects and pipeline steps come from the details endpoint."""
+    username = review.user.username if review.user else None
+    return {
+        "id": review.id,
+        "text": review.text,
+        "rating": review.rating,
+        "source": review.source,
+        "sentiment_label": review.sentiment_label,
+        "sentiment_score": review.sentiment_score,
+        "overall_sentiment": review.sentiment_label or "Neutral",
+        "timestamp": review.created_at.strftime("%Y-%m-%d %H:%M"),
+        "user_id": review.user_id,
+        "username": username,
+        "is_admin": username == 'admin',
+        "is_vip": bool(username) and username.lower().startswith('vip')
+    }
+
 def get_pipeline_steps(review):
     return [
         {"name": "Original", "text": review.original_text or review.text},
@@ -195,55 +810,347 @@ def get_pipeline_steps(review):
         {"name": "Processed", "text": review.processed or (review.cleaned or review.text).lower().strip()}
     ]
 
-def analyze_aspect_sentiment_per_review(text):
-    aspects = extract_aspects(text)
-    doc = nlp(text)
+def analyze_aspect_sentiment_batch(texts, docs=None, text_sentiments=None):
+    """
+    Aspect sentiment for many reviews: each aspect takes the sentiment of the
+    sentence holding its first matched span, or of the whole review when the
+    span has no sentence. Only the spans inside that sentence are returned,
+    so the stored offsets and the label always come from the same place.
+    Every sentence needed across the batch is scored in one call, and a
+    sentence shared by several aspects is scored once. `text_sentiments`
+    (already-computed whole-review results) avoids rescoring the fallback.
+    """
+    texts = list(texts)
+    if docs is None:
+        docs = parse_many(texts)
+    plans = []
+    needed = {}
+    for i, (text, doc) in enumerate(zip(texts, docs)):
+        plan = []
+        for asp, spans in extract_aspect_spans(text, doc).items():
+            span = doc.char_span(*spans[0], alignment_mode="expand")
+            sent = span.sent if span is not None else None
+            source = None
+            if sent is not None:
+                source = sent.text
+                spans = [s for s in spans if sent.start_char <= s[0] and s[1] <= sent.end_char]
+            if source is None and (text_sentiments is None or text_sentiments[i] is None):
+                source = text
+            if source is not None:
+                needed.setdefault(source, None)
+            plan.append((asp, spans, source))
+        plans.append(plan)
+
+    scored = dict(zip(needed, analyze_sentiment_batch(list(needed)))) if needed else {}
     results = []
-    for asp in aspects:
-        aspect_sentiment = None
-        for sent in doc.sents:
-            if asp in sent.text.lower():
-                sent_res = analyze_sentiment(sent.text)
-                aspect_sentiment = {
-                    "aspect": asp,
-                    "label": sent_res["label"].capitalize(),
-                    "score": sent_res["score"]
-                }
-                break
-        if not aspect_sentiment:
-            sent_res = analyze_sentiment(text)
-            aspect_sentiment = {
+    for i, plan in enumerate(plans):
+        review_results = []
+        for asp, spans, source in plan:
+            sent_res = scored[source] if source is not None else text_sentiments[i]
+            review_results.append({
                 "aspect": asp,
                 "label": sent_res["label"].capitalize(),
-                "score": sent_res["score"]
-            }
-        results.append(aspect_sentiment)
+                "score": sent_res["score"],
+                "spans": spans
+            })
+        results.append(review_results)
     return results
 
-def highlight_text_with_aspects(text, aspects):
-    highlighted = text
-    for a in aspects:
-        color_class = {
-            "Positive": "highlight-positive",
-            "Negative": "highlight-negative",
-            "Neutral": "highlight-neutral"
-        }[a["label"]]
-        highlighted = re.sub(
-            rf"\b{re.escape(a['aspect'])}\b",
-            f"<span class='{color_class}'>{a['aspect']}</span>",
-            highlighted,
-            flags=re.IGNORECASE
-        )
-    return highlighted
+def analyze_aspect_sentiment_per_review(text, doc=None, text_sentiment=None):
+    return analyze_aspect_sentiment_batch(
+        [text],
+        [doc] if doc is not None else None,
+        [text_sentiment] if text_sentiment is not None else None
+    )[0]
+
+def review_sentiment(review):
+    """The review's stored whole-text result, or None if it hasn't been scored."""
+    if not review.sentiment_label:
+        return None
+    return {"label": review.sentiment_label, "score": review.sentiment_score}
+
+def store_review_aspects(review, aspect_results=None, doc=None):
+    """Attach ReviewAspect rows for a review (computed now unless given)."""
+    if aspect_results is None:
+        aspect_results = analyze_aspect_sentiment_per_review(review.text, doc, review_sentiment(review))
+    for a in aspect_results:
+        review.aspect_results.append(ReviewAspect(
+            aspect=a["aspect"],
+            label=a["label"],
+            score=a["score"],
+            model_version=MODEL_VERSION,
+            spans=json.dumps(a.get("spans", []))
+        ))
+    return aspect_results
+
+def stored_aspects(review):
+    """Read back the persisted aspect results in the analyzer's dict format."""
+    return [
+        {"aspect": a.aspect, "label": a.label, "score": a.score, "spans": json.loads(a.spans) if a.spans else []}
+        for a in review.aspect_results
+    ]
 
-def log_system_event(event_type, message, details=None):
+def parse_rating(value):
+    """Handle rating from CSV: default to 0 if missing or invalid."""
     try:
-        log = SystemLog(event_type=event_type, message=message, details=details)
-        db.session.add(log)
+        # Ensures "None" or blank strings from CSV result in rating 0
+        return int(value) if value else 0
+    except ValueError:
+        return 0
+
+def ingest_csv_rows(rows, resolve_user_id):
+    """
+    Clean, score and bulk-insert reviews parsed from a chunk of an uploaded
+    CSV. Sentiment is computed with one batched model call for the chunk and
+    reviews/aspect results are written with executemany INSERTs instead of
+    one ORM object per row. All model work happens before the first write,
+    so the INSERTs and the caller's commit hold SQLite's write lock only
+    briefly. The caller owns the commit.
+    Returns the number of reviews inserted.
+    """
+    pending = [(row, resolve_user_id(row)) for row in rows if row.get("text", "")]
+    if not pending:
+        return 0
+    texts = [row["text"] for row, _ in pending]
+    sentiments = analyze_sentiment_batch(texts)
+    # One spaCy Doc per review, shared by cleaning and aspect analysis
+    docs = parse_many(texts)
+    aspect_results = analyze_aspect_sentiment_batch(texts, docs, sentiments)
+    review_rows = []
+    now = datetime.utcnow()
+    for (row, user_id), sent, doc in zip(pending, sentiments, docs):
+        raw = row["text"]
+        clean_txt = cleaned_string(raw, doc)
+        tokenized_txt = " ".join(clean_txt.split())
+        processed_txt = tokenized_txt.lower()
+        review_rows.append({
+            "user_id": user_id,
+            "text": raw,
+            "rating": parse_rating(row.get("rating", 0)),
+            "source": row.get("source", "csv"),
+            "created_at": now,
+            "sentiment_label": sent["label"],
+            "sentiment_score": sent["score"],
+            "original_text": raw,
+            "cleaned": clean_txt,
+            "tokenized": tokenized_txt,
+            "processed": processed_txt
+        })
+    review_ids = db.session.scalars(
+        insert(Review).returning(Review.id, sort_by_parameter_order=True),
+        review_rows
+    ).all()
+
+    aspect_rows = []
+    rollup_entries = []
+    for review_id, review_row, review_aspects in zip(review_ids, review_rows, aspect_results):
+        rollup_entries.append(dict(review_row, aspects=review_aspects))
+        for a in review_aspects:
+            aspect_rows.append({
+                "review_id": review_id,
+                "aspect": a["aspect"],
+                "label": a["label"],
+                "score": a["score"],
+                "model_version": MODEL_VERSION,
+                "spans": json.dumps(a["spans"])
+            })
+    if aspect_rows:
+        db.session.execute(insert(ReviewAspect), aspect_rows)
+    update_rollups(rollup_entries)
+    return len(review_rows)
+
+def chunked(iterable, size):
+    """Yield lists of up to `size` items from any iterable."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+MAX_STORED_JOB_ERRORS = 20
+
+def _record_job_error(job, message, failed_rows=0):
+    errors = json.loads(job.errors) if job.errors else []
+    errors.append(message)
+    job.errors = json.dumps(errors[-MAX_STORED_JOB_ERRORS:])
+    job.error_count = (job.error_count or 0) + failed_rows
+
+def enqueue_ingest_job(csv_file, user_id=None, admin_id=None):
+    """Save an uploaded CSV to disk, persist an IngestJob and hand it to the worker pool."""
+    job = IngestJob(user_id=user_id, admin_id=admin_id, filename=secure_filename(csv_file.filename or "upload.csv"))
+    job.id = uuid.uuid4().hex
+    job.file_path = os.path.join(INGEST_DIR, f"{job.id}.csv")
+    csv_file.save(job.file_path)
+    db.session.add(job)
+    db.session.commit()
+    ingest_executor.submit(run_ingest_job, job.id)
+    return job
+
+def run_ingest_job(job_id):
+    """Worker entry point: process a job's CSV in chunks, committing each one."""
+    with app.app_context():
+        # Claim the job atomically: if another worker or process got to it
+        # first, the UPDATE matches nothing and this copy does no work
+        now = datetime.utcnow()
+        claimed = db.session.execute(
+            update(IngestJob)
+            .where(IngestJob.id == job_id, IngestJob.status == "queued")
+            .values(status="running", started_at=db.func.coalesce(IngestJob.started_at, now), heartbeat_at=now)
+        ).rowcount
         db.session.commit()
-    except Exception as e:
-        print(f"Failed to log system event: {e}")
-        db.session.rollback()
+        if not claimed:
+            db.session.remove()
+            return
+        job = db.session.get(IngestJob, job_id)
+
+        default_user_id = job.admin_id or job.user_id
+        if job.admin_id:
+            # Admin CSVs name the owner per row; resolve usernames once per job
+            user_ids = dict(db.session.query(User.username, User.id).all())
+            def resolve_user_id(row):
+                return user_ids.get(row.get("username"), default_user_id)
+        else:
+            def resolve_user_id(row):
+                return default_user_id
+
+        source = "admin CSV" if job.admin_id else "CSV"
+        try:
+            with open(job.file_path, "rb") as f:
+                # Rows are decoded and parsed lazily; skip rows already
+                # committed by an earlier (interrupted) run
+                rows = islice(iter_csv_rows(f), job.rows_processed or 0, None)
+                for chunk in chunked(rows, app.config["INGEST_CHUNK_SIZE"]):
+                    start_time = time.time()
+                    try:
+                        review_count = ingest_csv_rows(chunk, resolve_user_id)
+                        job.rows_processed = (job.rows_processed or 0) + len(chunk)
+                        job.reviews_added = (job.reviews_added or 0) + review_count
+                        job.heartbeat_at = datetime.utcnow()
+                        db.session.commit()
+                    except Exception as e:
+                        db.session.rollback()
+                        job.rows_processed = (job.rows_processed or 0) + len(chunk)
+                        _record_job_error(job, f"Rows {job.rows_processed - len(chunk) + 1}-{job.rows_processed}: {e}", len(chunk))
+                        job.heartbeat_at = datetime.utcnow()
+                        db.session.commit()
+                        continue
+                    processing_time = time.time() - start_time
+                    rows_per_second = review_count / processing_time if processing_time > 0 else 0
+                    log_system_event(
+                        event_type='processing_time',
+                        message=f"{review_count} reviews from {source} processed in {processing_time:.2f} seconds ({rows_per_second:.1f} rows/s).",
+                        details={
+                            "job_id": job_id,
+                            "rows": len(chunk),
+                            "seconds": round(processing_time, 3),
+                            "rows_per_second": round(rows_per_second, 1)
+                        }
+                    )
+            if job.error_count and not job.reviews_added:
+                # Every chunk failed: nothing was stored, so keep the file and
+                # let a retry start from the first row
+                job.status = "failed"
+                job.rows_processed = 0
+                log_system_event(
+                    event_type='upload_failed',
+                    message=f"{source} upload failed: no rows could be ingested.",
+                    details={"job_id": job_id}
+                )
+            else:
+                job.status = "completed"
+        except Exception as e:
+            db.session.rollback()
+            job.status = "failed"
+            _record_job_error(job, str(e))
+            log_system_event(
+                event_type='upload_failed',
+                message=f"{source} upload failed: {str(e)}",
+                details={"job_id": job_id}
+            )
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        if job.status == "completed" and os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        db.session.remove()
+
+def resume_ingest_jobs():
+    """Requeue jobs left unfinished by a previous server process."""
+    stale = datetime.utcnow() - timedelta(seconds=app.config["INGEST_JOB_STALE_AFTER"])
+    db.session.execute(
+        update(IngestJob)
+        .where(IngestJob.status == "running", or_(IngestJob.heartbeat_at.is_(None), IngestJob.heartbeat_at < stale))
+        .values(status="queued")
+    )
+    db.session.commit()
+    # Other processes may submit the same jobs; the claim in run_ingest_job keeps it to one run
+    for job_id in db.session.scalars(select(IngestJob.id).where(IngestJob.status == "queued")).all():
+        ingest_executor.submit(run_ingest_job, job_id)
+
+_ingest_resume_lock = threading.Lock()
+_ingest_resumed = False
+
+def ensure_ingest_resumed():
+    """Resume interrupted jobs once per process, under any server, off the request thread."""
+    global _ingest_resumed
+    with _ingest_resume_lock:
+        if _ingest_resumed:
+            return
+        _ingest_resumed = True
+    ingest_executor.submit(_resume_ingest_jobs_in_background)
+
+def _resume_ingest_jobs_in_background():
+    with app.app_context():
+        try:
+            resume_ingest_jobs()
+        except Exception:
+            app.logger.exception("Failed to resume ingest jobs")
+        finally:
+            db.session.remove()
+
+# --- System log writer ---
+# Events never touch the caller's session: they are queued and inserted in
+# batches on the writer thread's own connection, so logging can't commit or
+# roll back a request's pending work and costs one transaction per batch.
+def write_system_logs(rows):
+    with app.app_context(), db.engine.begin() as conn:
+        conn.execute(insert(SystemLog), rows)
+
+def compact_system_logs():
+    """Delete logs older than the retention window, then the oldest beyond the row cap."""
+    cutoff = datetime.utcnow() - timedelta(days=app.config["SYSTEM_LOG_RETENTION_DAYS"])
+    with app.app_context(), db.engine.begin() as conn:
+        deleted = conn.execute(delete(SystemLog).where(SystemLog.timestamp < cutoff)).rowcount
+        oldest_kept = conn.execute(
+            select(SystemLog.id).order_by(SystemLog.id.desc())
+            .offset(app.config["SYSTEM_LOG_MAX_ROWS"] - 1).limit(1)
+        ).scalar()
+        if oldest_kept is not None:
+            deleted += conn.execute(delete(SystemLog).where(SystemLog.id < oldest_kept)).rowcount
+    return deleted
+
+system_log_writer = BufferedWriter(
+    write_system_logs,
+    max_queue=app.config["SYSTEM_LOG_QUEUE_SIZE"],
+    batch_size=app.config["SYSTEM_LOG_BATCH_SIZE"],
+    flush_interval=app.config["SYSTEM_LOG_FLUSH_INTERVAL"],
+    maintenance=compact_system_logs,
+    maintenance_interval=app.config["SYSTEM_LOG_COMPACT_INTERVAL"],
+    name="system-log-writer"
+)
+# Give queued events a moment to reach the database on shutdown
+atexit.register(system_log_writer.flush)
+
+def log_system_event(event_type, message, details=None):
+    """Queue a SystemLog event; `details` may be a dict, stored as JSON."""
+    if details is not None and not isinstance(details, str):
+        details = json.dumps(details)
+    system_log_writer.submit({
+        "event_type": event_type,
+        "message": message[:255],
+        "details": details,
+        "timestamp": datetime.utcnow()
+    })
 
 # ==================== User Profile Routes (UNCHANGED) ====================
 
@@ -263,6 +1170,11 @@ def update_profile():
     if not new_username or not new_email:
         return jsonify({"success": False, "message": "Username and email cannot be empty"}), 400
 
+    if new_username != user.username:
+        # Usernames are printed in the user's and the system reports
+        bump_rollup_versions([user.id])
+        mark_reports_stale([user.id])
+
     # Use the User model's update method
     success, message = user.update_user(new_username, new_email)
     
@@ -314,6 +1226,9 @@ def deactivate_user(user_id):
 @app.route('/admin/delete_user/<int:user_id>', methods=['POST'])
 def delete_user(user_id):
     user = User.query.get_or_404(user_id)
+    # The user's reviews are orphaned (user_id NULL) but still count system-wide
+    move_rollups(user.id, ORPHANED_USER_ID)
+    bump_rollup_versions([])
     db.session.delete(user)
     db.session.commit()
     return jsonify({"success": True})
@@ -341,6 +1256,7 @@ def add_aspect_category():
     new_aspect = AspectCategory(name=name)
     db.session.add(new_aspect)
     db.session.commit()
+    invalidate_aspect_matcher()
     return jsonify({"success": True, "id": new_aspect.id, "name": new_aspect.name})
 
 @app.route('/admin/aspect_categories/delete/<int:aspect_id>', methods=['POST'])
@@ -348,6 +1264,7 @@ def delete_aspect_category(aspect_id):
     aspect = AspectCategory.query.get_or_404(aspect_id)
     db.session.delete(aspect)
     db.session.commit()
+    invalidate_aspect_matcher()
     return jsonify({"success": True})
 
 @app.route('/admin/aspect_categories/edit/<int:aspect_id>', methods=['POST'])
@@ -361,6 +1278,7 @@ def edit_aspect_category(aspect_id):
     
     aspect.name = new_name
     db.session.commit()
+    invalidate_aspect_matcher()
     return jsonify({"success": True, "id": aspect.id, "name": aspect.name})
 
 # --- Feedback status update route (for admins to manage tickets) ---
@@ -457,7 +1375,8 @@ def dashboard():
             rating_val = int(rating)
             
         if text:
-            clean_txt = cleaned_string(text)
+            doc = parse(text)
+            clean_txt = cleaned_string(text, doc)
             tokenized_txt = " ".join(clean_txt.split())
             processed_txt = tokenized_txt.lower()
             sentiment = analyze_sentiment(text)
@@ -472,56 +1391,19 @@ def dashboard():
                 tokenized=tokenized_txt,
                 processed=processed_txt
             )
+            review_aspects = store_review_aspects(review, doc=doc)
             db.session.add(review)
+            db.session.flush()
+            update_rollups([rollup_entry(review, review_aspects)])
             db.session.commit()
             flash("Review submitted!", "success")
             return redirect(url_for("dashboard"))
         csv_file = request.files.get("csv_file")
         if csv_file:
-            start_time = time.time()
             try:
-                decoded_file = csv_file.read().decode("utf-8").splitlines()
-                reader = csv.DictReader(decoded_file)
-                review_count = 0
-                for row in reader:
-                    raw = row.get("text", "")
-                    if not raw:
-                        continue
-                    
-                    # Handle rating from CSV: default to 0 if missing or invalid
-                    csv_rating = row.get("rating", 0)
-                    try:
-                        # Ensures "None" or blank strings from CSV result in rating 0
-                        csv_rating_val = int(csv_rating) if csv_rating else 0 
-                    except ValueError:
-                        csv_rating_val = 0
-                        
-                    clean_txt = cleaned_string(raw)
-                    tokenized_txt = " ".join(clean_txt.split())
-                    processed_txt = tokenized_txt.lower()
-                    sent = analyze_sentiment(raw)
-                    review = Review(
-                        user_id=user.id,
-                        text=raw,
-                        rating=csv_rating_val,
-                        source=row.get("source", "csv"),
-                        sentiment_label=sent["label"],
-                        sentiment_score=sent["score"],
-                        original_text=raw,
-                        cleaned=clean_txt,
-                        tokenized=tokenized_txt,
-                        processed=processed_txt
-                    )
-                    db.session.add(review)
-                    review_count += 1
-                db.session.commit()
-                end_time = time.time()
-                processing_time = end_time - start_time
-                log_system_event(
-                    event_type='processing_time',
-                    message=f"{review_count} reviews from CSV processed in {processing_time:.2f} seconds."
-                )
-                flash("CSV reviews uploaded successfully!", "success")
+                job = enqueue_ingest_job(csv_file, user_id=user.id)
+                session["ingest_job_id"] = job.id
+                flash("CSV upload queued. Reviews will appear as they are processed.", "success")
             except Exception as e:
                 db.session.rollback()
                 log_system_event(
@@ -531,52 +1413,21 @@ def dashboard():
                 flash(f"CSV upload failed: {e}", "danger")
             return redirect(url_for("dashboard"))
 
-    reviews = Review.query.filter_by(user_id=user.id).order_by(Review.created_at.desc()).all()
-
-    for r in reviews:
-        review_aspects = analyze_aspect_sentiment_per_review(r.text)
-        pipeline_steps = get_pipeline_steps(r)
-        setattr(r, "aspects", review_aspects)
-        setattr(r, "aspect_tags", review_aspects)
-        setattr(r, "pipeline_steps", pipeline_steps)
-        setattr(r, "timestamp", r.created_at.strftime("%Y-%m-%d %H:%M"))
-        # ADDED: Attach the overall sentiment label to the object for display
-        setattr(r, "overall_sentiment", r.sentiment_label or "Neutral")
-
-    # --- UPDATED: Calculate sentiment distribution based on model's sentiment_label ---
-    user_pos_count = sum(1 for r in reviews if r.sentiment_label and r.sentiment_label.lower() == 'positive')
-    user_neg_count = sum(1 for r in reviews if r.sentiment_label and r.sentiment_label.lower() == 'negative')
-    user_neu_count = sum(1 for r in reviews if r.sentiment_label and r.sentiment_label.lower() == 'neutral')
+    # --- UPDATED: Sentiment distribution of the model's sentiment_label, from the rollups ---
+    sentiment_counts = rollup_sentiment_counts(user.id)
+    user_pos_count = sentiment_counts['positive']
+    user_neg_count = sentiment_counts['negative']
+    user_neu_count = sentiment_counts['neutral']
     
     # --- NEW METRICS FOR DASHBOARD ---
-    user_reviews_submitted = len(reviews)
+    user_reviews_submitted = rollup_review_count(user.id)
     total = user_pos_count + user_neg_count + user_neu_count
     total_reviews_analyzed = total
     # ---------------------------------
 
-    aspect_summary = analyze_aspect_sentiment(reviews)
-
-    def get_sentiment_trends(reviews):
-        import pandas as pd
-        data = []
-        for r in reviews:
-            date_str = r.created_at.strftime("%Y-%m-%d")
-            label = r.sentiment_label or "neutral"
-            data.append({"date": date_str, "label": label})
-        df = pd.DataFrame(data)
-        trend_df = df.groupby(["date", "label"]).size().reset_index(name="count")
-        pivot_df = trend_df.pivot(index='date', columns='label', values='count').fillna(0)
-        for sentiment in ['positive', 'negative', 'neutral']:
-            if sentiment not in pivot_df.columns:
-                pivot_df[sentiment] = 0
-        pivot_df = pivot_df.sort_index()
-        labels_time = list(pivot_df.index)
-        pos_counts = list(pivot_df['positive'])
-        neg_counts = list(pivot_df['negative'])
-        neu_counts = list(pivot_df['neutral'])
-        return labels_time, pos_counts, neg_counts, neu_counts
-
-    trend_labels, trend_positive, trend_negative, trend_neutral = get_sentiment_trends(reviews)
+    aspect_summary = analyze_aspect_sentiment(user.id)
+
+    trend_labels, trend_positive, trend_negative, trend_neutral = rollup_sentiment_trends(user.id)
 
     # Compute top 5 positive and negative aspects
     sorted_aspects = sorted(aspect_summary, key=lambda a: a["positive"], reverse=True)
@@ -588,7 +1439,6 @@ def dashboard():
     return render_template(
         "dashboard.html",
         user=user,
-        reviews=reviews,
         user_pos_count=user_pos_count,
         user_neg_count=user_neg_count,
         user_neu_count=user_neu_count,
@@ -609,7 +1459,8 @@ def dashboard():
         trend_negative=trend_negative,
         trend_neutral=trend_neutral,
         top_positive_aspects=top_positive_aspects,
-        top_negative_aspects=top_negative_aspects
+        top_negative_aspects=top_negative_aspects,
+        ingest_job_id=session.get("ingest_job_id")
     )
 
 @app.route("/logout")
@@ -646,27 +1497,25 @@ def admin_dashboard():
 
     # --- START DATA COLLECTION (Consolidated Logic - Must run before any return) ---
     users = User.query.all()
-    reviews = Review.query.order_by(Review.created_at.desc()).all()
     aspects = AspectCategory.query.all()
 
-    now = datetime.utcnow()
-    reviews_today = Review.query.filter(Review.created_at >= (now - timedelta(days=1))).count()
-    reviews_week = Review.query.filter(Review.created_at >= (now - timedelta(weeks=1))).count()
-    reviews_month = Review.query.filter(Review.created_at >= (now - timedelta(days=30))).count()
+    window_counts = review_window_counts()
+    reviews_today = window_counts["today"]
+    reviews_week = window_counts["week"]
+    reviews_month = window_counts["month"]
     
     # FIX: Ensure all base counter variables are defined here
     total_users = User.query.count() 
-    total_reviews = Review.query.count()
+    total_reviews = rollup_review_count()
     total_datasets = total_reviews
     recent_activity = reviews_today
 
-    most_active_users = db.session.query(
-        User.username, 
-        db.func.count(Review.id).label('review_count')
-    ).join(Review).group_by(User.id).order_by(db.desc('review_count')).limit(10).all()
+    most_active_users = rollup_most_active_users()
 
-    all_reviews = Review.query.all()
-    all_aspects = analyze_aspect_sentiment(all_reviews)
+    # Per-user review count and last review date for the User Management tab
+    user_review_stats = rollup_user_review_stats()
+
+    all_aspects = analyze_aspect_sentiment()
     common_aspects = sorted(all_aspects, key=lambda x: x['positive'] + x['negative'] + x['neutral'], reverse=True)[:10]
     # --- END DATA COLLECTION ---
 
@@ -702,52 +1551,11 @@ def admin_dashboard():
         # Original CSV upload logic
         csv_file = request.files.get("csv_file")
         if csv_file:
-            start_time = time.time()
             try:
-                decoded_file = csv_file.read().decode("utf-8").splitlines()
-                reader = csv.DictReader(decoded_file)
-                review_count = 0
-                for row in reader:
-                    user_lookup = User.query.filter_by(username=row.get("username")).first()
-                    user_id_to_use = user_lookup.id if user_lookup else admin.id
-
-                    raw = row.get("text", "")
-                    if not raw:
-                        continue
-                    
-                    # Handle rating from CSV: default to 0 if missing or invalid
-                    csv_rating = row.get("rating", 0)
-                    try:
-                        csv_rating_val = int(csv_rating) if csv_rating else 0
-                    except ValueError:
-                        csv_rating_val = 0
-                        
-                    clean_txt = cleaned_string(raw)
-                    tokenized_txt = " ".join(clean_txt.split())
-                    processed_txt = tokenized_txt.lower()
-                    sent = analyze_sentiment(raw)
-                    review = Review(
-                        user_id=user_id_to_use,
-                        text=raw,
-                        rating=csv_rating_val,
-                        source=row.get("source", "csv"),
-                        sentiment_label=sent["label"],
-                        sentiment_score=sent["score"],
-                        original_text=raw,
-                        cleaned=clean_txt,
-                        tokenized=tokenized_txt,
-                        processed=processed_txt
-                    )
-                    db.session.add(review)
-                    review_count += 1
-                db.session.commit()
-                end_time = time.time()
-                processing_time = end_time - start_time
-                log_system_event(
-                    event_type='processing_time',
-                    message=f"{review_count} reviews from admin CSV processed in {processing_time:.2f} seconds."
-                )
-                flash("CSV reviews uploaded successfully!", "success")
+                job = enqueue_ingest_job(csv_file, admin_id=admin.id)
+                # Kept apart from the user dashboard's key so each page polls only its own jobs
+                session["admin_ingest_job_id"] = job.id
+                flash("CSV upload queued. Reviews will appear as they are processed.", "success")
             except Exception as e:
                 db.session.rollback()
                 log_system_event(
@@ -758,30 +1566,11 @@ def admin_dashboard():
             return redirect(url_for("admin_dashboard"))
 
     # Count stats for Analytics tab (must run for GET and POST fallback)
-    pos_count = sum(1 for r in reviews if r.sentiment_label and r.sentiment_label.lower() == 'positive')
-    neg_count = sum(1 for r in reviews if r.sentiment_label and r.sentiment_label.lower() == 'negative')
-    neu_count = sum(1 for r in reviews if r.sentiment_label and r.sentiment_label.lower() == 'neutral')
-    admin_aspect_data = analyze_aspect_sentiment(reviews)
-
-    reviews_by_user = {}
-    for r in reviews:
-        if r.user:
-            is_admin = (r.user.username == 'admin')
-            is_vip = r.user.username.lower().startswith('vip')
-            review_aspects = analyze_aspect_sentiment_per_review(r.text)
-            pipeline_steps = get_pipeline_steps(r)
-
-            setattr(r, "username", r.user.username)
-            setattr(r, "is_admin", is_admin)
-            setattr(r, "is_vip", is_vip)
-            setattr(r, "aspect_tags", review_aspects)
-            setattr(r, "review_aspects", review_aspects)
-            setattr(r, "aspects", review_aspects)
-            setattr(r, "pipeline_steps", pipeline_steps)
-            setattr(r, "highlighted_text", highlight_text_with_aspects(r.text, review_aspects))
-            setattr(r, "timestamp", r.created_at.strftime("%Y-%m-%d %H:%M"))
-
-            reviews_by_user.setdefault(r.user.username, []).append(r)
+    sentiment_counts = rollup_sentiment_counts()
+    pos_count = sentiment_counts['positive']
+    neg_count = sentiment_counts['negative']
+    neu_count = sentiment_counts['neutral']
+    admin_aspect_data = all_aspects
 
     # Fetch submitted feedback for the Feedback tab
     submitted_feedback = Feedback.query.order_by(Feedback.created_at.desc()).all()
@@ -791,8 +1580,7 @@ def admin_dashboard():
         "admin_dashboard.html",
         admin=admin,
         users=users,
-        reviews=reviews,
-        reviews_by_user=reviews_by_user,
+        user_review_stats=user_review_stats,
         pos_count=pos_count,
         neg_count=neg_count,
         neu_count=neu_count,
@@ -807,7 +1595,8 @@ def admin_dashboard():
         reviews_month=reviews_month,
         most_active_users=most_active_users,
         common_aspects=common_aspects,
-        submitted_feedback=submitted_feedback
+        submitted_feedback=submitted_feedback,
+        ingest_job_id=session.get("admin_ingest_job_id")
     )
 
 @app.route("/admin_logout")
@@ -843,6 +1632,79 @@ def get_performance_logs():
         })
     return jsonify(log_list)
 
+# ==================== Review listing API (keyset pagination) ====================
+
+@app.route('/api/reviews')
+def list_user_reviews():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    query = Review.query.filter_by(user_id=session["user_id"]).options(joinedload(Review.user))
+    try:
+        page, next_cursor = paginate_reviews(query, request.args.get("cursor"), page_size_arg())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"reviews": [review_summary(r) for r in page], "next_cursor": next_cursor})
+
+@app.route('/api/admin/reviews')
+def list_admin_reviews():
+    if "admin_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    query = Review.query.options(joinedload(Review.user))
+    user_id = request.args.get("user_id", type=int)
+    if user_id is not None:
+        query = query.filter(Review.user_id == user_id)
+    try:
+        page, next_cursor = paginate_reviews(query, request.args.get("cursor"), page_size_arg())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"reviews": [review_summary(r) for r in page], "next_cursor": next_cursor})
+
+@app.route('/api/reviews/search')
+def search_reviews_api():
+    if "user_id" not in session and "admin_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    # Users search their own reviews; admins search everything (optionally one user's)
+    user_id = request.args.get("user_id", type=int) if "admin_id" in session else session["user_id"]
+    try:
+        page, next_offset = search_reviews(
+            request.args.get("q", ""),
+            user_id=user_id,
+            sentiment=request.args.get("sentiment"),
+            aspect=request.args.get("aspect"),
+            date_from=parse_date_arg("from"),
+            date_to=parse_date_arg("to"),
+            limit=page_size_arg(),
+            offset=max(0, request.args.get("offset", 0, type=int))
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "reviews": [dict(review_summary(review), snippet_html=snippet) for review, snippet in page],
+        "next_offset": next_offset
+    })
+
+@app.route('/api/reviews/<int:review_id>/details')
+def get_review_details(review_id):
+    review = Review.query.options(selectinload(Review.aspect_results)).get_or_404(review_id)
+    is_owner = review.user_id is not None and review.user_id == session.get("user_id")
+    if not is_owner and "admin_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    aspects = stored_aspects(review)
+    return jsonify({
+        "id": review.id,
+        "pipeline_steps": get_pipeline_steps(review),
+        "aspects": aspects,
+        "highlighted_html": highlight_aspects(review.text, aspects)
+    })
+
+@app.route('/api/ingest/<job_id>')
+def get_ingest_job(job_id):
+    job = IngestJob.query.get_or_404(job_id)
+    is_owner = job.user_id is not None and job.user_id == session.get("user_id")
+    if not is_owner and "admin_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    return jsonify(job.to_dict())
+
 @app.route('/api/system_monitoring/model_accuracy_check')
 def get_model_accuracy_sample():
     total_reviews = db.session.query(Review).count()
@@ -877,28 +1739,62 @@ def submit_model_feedback():
     
     return jsonify({'status': 'success', 'message': 'Feedback received'})
 
-@app.route('/api/system_monitoring/server_stats')
-def get_server_stats():
-    # CPU Usage
-    cpu_percent = psutil.cpu_percent(interval=1)
-    
-    # Memory Usage
-    memory = psutil.virtual_memory()
-    memory_percent = memory.percent
-    
-    # Disk Usage
-    disk = psutil.disk_usage('/')
-    disk_percent = disk.percent
+@app.route('/api/system_monitoring/route_metrics')
+def get_route_metrics():
+    return jsonify(request_metrics.summary())
 
-    # Number of datasets stored (using Review records as a proxy)
-    num_datasets = Review.query.count()
+@app.route('/metrics')
+def metrics():
+    return Response(request_metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
 
-    return jsonify({
-        'cpu_usage_percent': cpu_percent,
-        'memory_usage_percent': memory_percent,
-        'disk_usage_percent': disk_percent,
-        'datasets_stored': num_datasets
-    })
+@app.route('/api/system_monitoring/inference_cache')
+def get_inference_cache_stats():
+    return jsonify(inference_cache_stats())
+
+@app.route('/api/system_monitoring/log_writer')
+def get_log_writer_stats():
+    return jsonify(system_log_writer.stats())
+
+@app.route('/api/system_monitoring/batching')
+def get_batching_stats():
+    return jsonify(batching_stats())
+
+def sampled_datasets_stored():
+    # Number of datasets stored (using Review records as a proxy), from the rollups
+    with app.app_context():
+        try:
+            return rollup_review_count()
+        finally:
+            db.session.remove()
+
+# Host/process stats are sampled in the background; the endpoint only reads them
+stats_sampler = StatsSampler(
+    interval=app.config["STATS_SAMPLE_INTERVAL"],
+    history=app.config["STATS_HISTORY_POINTS"],
+    probes={
+        "datasets_stored": sampled_datasets_stored,
+        "inference_queue_depth": inference_queue_depth,
+        "db_size_mb": lambda: file_size_mb(DATABASE_PATH, DATABASE_PATH + "-wal"),
+    }
+)
+
+@app.route('/api/system_monitoring/server_stats')
+def get_server_stats():
+    """
+    Latest sample, or {"points": [...]} for the last ?window= seconds.
+    Until the sampler's first interval has elapsed there is no sample yet,
+    and the response says "warming_up" instead of measuring on this thread.
+    """
+    stats_sampler.ensure_started()
+    latest = stats_sampler.latest()
+    window = request.args.get("window", type=int)
+    if window:
+        return jsonify({
+            "interval": stats_sampler.interval,
+            "points": stats_sampler.window(window),
+            "warming_up": latest is None
+        })
+    return jsonify(latest if latest is not None else {"warming_up": True})
 
 # =================== Additional pages routes (UPDATED REDIRECTS) ====================
 
@@ -924,67 +1820,216 @@ def feedback_support():
     return redirect(url_for("admin_dashboard", _anchor="feedback_support"))
 
 
+# --- Pre-rendered report cache ---
+# Summary reports are rendered once per data version and served from disk
+# with ETag/Last-Modified; a background thread re-renders the ones whose
+# data changed so downloads stay instant.
+REPORT_FORMATS = {"csv": "text/csv", "pdf": "application/pdf"}
+_stale_report_scopes = set()
+_stale_report_lock = threading.Lock()
+
+def mark_reports_stale(user_ids):
+    """Queue these users' reports for re-rendering once the current transaction commits."""
+    db.session.info.setdefault("stale_report_scopes", set()).update(user_ids)
+
+@event.listens_for(Session, "after_commit")
+def queue_stale_reports(session):
+    # Only now can the refresher read the new data version
+    user_ids = session.info.pop("stale_report_scopes", None)
+    if user_ids:
+        with _stale_report_lock:
+            _stale_report_scopes.update(user_ids)
+
+@event.listens_for(Session, "after_rollback")
+def drop_stale_reports(session):
+    session.info.pop("stale_report_scopes", None)
+
+def report_data_version(user_id=None):
+    """Changes whenever reviews or their aspects change in this scope."""
+    row = db.session.get(RollupVersion, SYSTEM_SCOPE if user_id is None else user_id)
+    version = f"v{row.version if row else 0}"
+    if user_id is None:
+        # System reports show last-24h/7d/30d counts, so they also age hourly
+        version += "." + datetime.utcnow().strftime("%Y%m%d%H")
+    return version
+
+def render_report(report, fmt, user=None):
+    total_reviews = rollup_review_count(user.id if user else None)
+    if report == "system_report":
+        return csv_bytes(system_report_rows(total_reviews)) if fmt == "csv" else render_system_pdf(total_reviews)
+    return csv_bytes(user_report_rows(user, total_reviews)) if fmt == "csv" else render_user_pdf(user, total_reviews)
+
+def cached_report_path(report, fmt, user=None):
+    """Path of the rendered report for the current data version, rendering it on a miss."""
+    scope = f"user{user.id}" if user else "system"
+    version = report_data_version(user.id if user else None)
+    path = report_cache.get(report, scope, version, fmt)
+    if path is None:
+        path = report_cache.put(report, scope, version, fmt, render_report(report, fmt, user))
+    return path, f"{report}-{scope}-{version}.{fmt}"
+
+def send_cached_report(report, fmt, download_name, user=None):
+    path, etag = cached_report_path(report, fmt, user)
+    return send_file(
+        path,
+        mimetype=REPORT_FORMATS[fmt],
+        download_name=download_name,
+        as_attachment=True,
+        conditional=True,
+        etag=etag,
+        max_age=0
+    )
+
+def refresh_reports():
+    """Pre-render the system reports and those of users whose data changed, then evict."""
+    with _stale_report_lock:
+        user_ids = set(_stale_report_scopes)
+        _stale_report_scopes.clear()
+    for user_id in [None, *user_ids]:
+        user = db.session.get(User, user_id) if user_id is not None else None
+        if (user_id is not None and user is None) or not rollup_review_count(user_id):
+            continue
+        report = "review_report" if user else "system_report"
+        for fmt in REPORT_FORMATS:
+            cached_report_path(report, fmt, user)
+    report_cache.evict()
+
+_report_refresher = None
+_report_refresher_lock = threading.Lock()
+
+def ensure_report_refresher_started():
+    """Start the background re-render thread once per process, under any server."""
+    global _report_refresher
+    with _report_refresher_lock:
+        if _report_refresher is None:
+            _report_refresher = threading.Thread(target=run_report_refresher, name="report-refresher", daemon=True)
+            _report_refresher.start()
+
+def run_report_refresher():
+    while True:
+        time.sleep(app.config["REPORT_REFRESH_INTERVAL"])
+        with app.app_context():
+            try:
+                refresh_reports()
+            except Exception as e:
+                app.logger.warning("Report refresh failed: %s", e)
+            finally:
+                db.session.remove()
+
+def csv_bytes(rows):
+    output = io.StringIO()
+    csv.writer(output).writerows(rows)
+    return output.getvalue().encode("utf-8")
+
+# --- Streaming CSV reports ---
+REPORT_STREAM_BUFFER = 64 * 1024
+REPORT_YIELD_PER = 1000
+
+def stream_csv(rows, filename):
+    """
+    Download response that writes CSV rows as they are produced, in chunks
+    of about REPORT_STREAM_BUFFER bytes, so the first byte goes out at once
+    and memory stays flat however many rows follow.
+    """
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= REPORT_STREAM_BUFFER:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    response = Response(stream_with_context(generate()), mimetype="text/csv")
+    # Same Content-Disposition encoding as send_file: quoted, plus an RFC 5987 filename* for non-ASCII names
+    try:
+        filename.encode("ascii")
+        names = {"filename": filename}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+        names = {"filename": simple, "filename*": f"UTF-8''{quote(filename, safe='!#$&+-.^_`|~')}"}
+    response.headers.set("Content-Disposition", "attachment", **names)
+    return response
+
+def review_detail_rows(user_id=None):
+    """Header plus one row per review (with its aspects), read in yield_per batches."""
+    yield ["Review ID", "Created At", "Username", "Rating", "Source", "Sentiment", "Score", "Aspects", "Text"]
+    query = (
+        db.select(Review)
+        .options(joinedload(Review.user), selectinload(Review.aspect_results))
+        .order_by(Review.id)
+        .execution_options(yield_per=REPORT_YIELD_PER)
+    )
+    if user_id is not None:
+        query = query.where(Review.user_id == user_id)
+    for review in db.session.scalars(query):
+        yield [
+            review.id,
+            review.created_at.isoformat() if review.created_at else "",
+            review.user.username if review.user else "",
+            review.rating,
+            review.source,
+            review.sentiment_label,
+            review.sentiment_score,
+            "; ".join(f"{a.aspect} ({a.label})" for a in review.aspect_results),
+            review.text
+        ]
+
 @app.route('/generate_system_report')
 def generate_system_report():
     if "admin_id" not in session:
         return jsonify({"error": "Unauthorized"}), 401
     
-    all_reviews = Review.query.all()
-    if not all_reviews:
+    if not rollup_review_count():
         return jsonify({"error": "No reviews to generate report."}), 404
 
-    # Aggregated data
-    total_reviews = len(all_reviews)
-    reviews_today = len([r for r in all_reviews if r.created_at >= (datetime.utcnow() - timedelta(days=1))])
-    reviews_week = len([r for r in all_reviews if r.created_at >= (datetime.utcnow() - timedelta(weeks=1))])
-    reviews_month = len([r for r in all_reviews if r.created_at >= (datetime.utcnow() - timedelta(days=30))])
+    filename = f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    if request.args.get("detail") == "1":
+        return stream_csv(review_detail_rows(), filename.replace("system_report", "system_reviews"))
+    return send_cached_report("system_report", "csv", filename)
+
+def system_report_rows(total_reviews):
+    # Aggregated data (from the rollup tables)
+    window_counts = review_window_counts()
+    reviews_today = window_counts["today"]
+    reviews_week = window_counts["week"]
+    reviews_month = window_counts["month"]
     total_datasets = total_reviews
     
-    most_active_users = db.session.query(
-        User.username, 
-        db.func.count(Review.id).label('review_count')
-    ).join(Review).group_by(User.id).order_by(db.desc('review_count')).limit(10).all()
+    most_active_users = rollup_most_active_users()
     
-    all_aspects = analyze_aspect_sentiment(all_reviews)
+    all_aspects = analyze_aspect_sentiment()
     common_aspects = sorted(all_aspects, key=lambda x: x['positive'] + x['negative'] + x['neutral'], reverse=True)[:10]
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow(["System Report"])
-    writer.writerow(["Generated On", datetime.utcnow().isoformat()])
-    writer.writerow([])
+    yield ["System Report"]
+    yield ["Generated On", datetime.utcnow().isoformat()]
+    yield []
     
-    writer.writerow(["Dataset Summary"])
-    writer.writerow(["Total Reviews", total_reviews])
-    writer.writerow(["Total Datasets", total_datasets])
-    writer.writerow(["Reviews (Last 24h)", reviews_today])
-    writer.writerow(["Reviews (Last 7 days)", reviews_week])
-    writer.writerow(["Reviews (Last 30 days)", reviews_month])
-    writer.writerow([])
+    yield ["Dataset Summary"]
+    yield ["Total Reviews", total_reviews]
+    yield ["Total Datasets", total_datasets]
+    yield ["Reviews (Last 24h)", reviews_today]
+    yield ["Reviews (Last 7 days)", reviews_week]
+    yield ["Reviews (Last 30 days)", reviews_month]
+    yield []
     
-    writer.writerow(["Most Active Users (Top 10)"])
-    writer.writerow(["Username", "Review Count"])
+    yield ["Most Active Users (Top 10)"]
+    yield ["Username", "Review Count"]
     for user in most_active_users:
-        writer.writerow([user.username, user.review_count])
-    writer.writerow([])
+        yield [user.username, user.review_count]
+    yield []
     
-    writer.writerow(["Most Common Aspects (Top 10)"])
-    writer.writerow(["Aspect", "Positive", "Negative", "Neutral"])
+    yield ["Most Common Aspects (Top 10)"]
+    yield ["Aspect", "Positive", "Negative", "Neutral"]
     for aspect in common_aspects:
-        writer.writerow([
+        yield [
             aspect['aspect'], 
             aspect['positive'], 
             aspect['negative'], 
             aspect['neutral']
-        ])
-
-    output.seek(0)
-    mem = io.BytesIO()
-    mem.write(output.getvalue().encode('utf-8'))
-    mem.seek(0)
-    filename = f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    return send_file(mem, mimetype='text/csv', download_name=filename, as_attachment=True)
+        ]
 
 
 @app.route('/generate_system_pdf_report')
@@ -992,23 +2037,23 @@ def generate_system_pdf_report():
     if "admin_id" not in session:
         return jsonify({"error": "Unauthorized"}), 401
     
-    all_reviews = Review.query.all()
-    if not all_reviews:
+    if not rollup_review_count():
         return jsonify({"error": "No reviews to generate report."}), 404
 
-    # Aggregated data
-    total_reviews = len(all_reviews)
-    reviews_today = len([r for r in all_reviews if r.created_at >= (datetime.utcnow() - timedelta(days=1))])
-    reviews_week = len([r for r in all_reviews if r.created_at >= (datetime.utcnow() - timedelta(weeks=1))])
-    reviews_month = len([r for r in all_reviews if r.created_at >= (datetime.utcnow() - timedelta(days=30))])
+    filename = f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    return send_cached_report("system_report", "pdf", filename)
+
+def render_system_pdf(total_reviews):
+    # Aggregated data (from the rollup tables)
+    window_counts = review_window_counts()
+    reviews_today = window_counts["today"]
+    reviews_week = window_counts["week"]
+    reviews_month = window_counts["month"]
     total_datasets = total_reviews
     
-    most_active_users = db.session.query(
-        User.username, 
-        db.func.count(Review.id).label('review_count')
-    ).join(Review).group_by(User.id).order_by(db.desc('review_count')).limit(10).all()
+    most_active_users = rollup_most_active_users()
     
-    all_aspects = analyze_aspect_sentiment(all_reviews)
+    all_aspects = analyze_aspect_sentiment()
     common_aspects = sorted(all_aspects, key=lambda x: x['positive'] + x['negative'] + x['neutral'], reverse=True)[:10]
 
     mem = io.BytesIO()
@@ -1073,9 +2118,7 @@ def generate_system_pdf_report():
 
     c.showPage()
     c.save()
-    mem.seek(0)
-    filename = f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    return send_file(mem, mimetype='application/pdf', download_name=filename, as_attachment=True)
+    return mem.getvalue()
 
 
 # ==================== Report generation routes (UNCHANGED) ====================
@@ -1085,93 +2128,80 @@ def generate_report():
     if "user_id" not in session:
         return redirect(url_for("login"))
     user = User.query.get(session["user_id"])
-    reviews = Review.query.filter_by(user_id=user.id).order_by(Review.created_at).all()
-    if not reviews:
+    if not rollup_review_count(user.id):
         flash("No reviews to generate report.", "warning")
         return redirect(url_for("dashboard"))
 
-    total_reviews = len(reviews)
-    time_range_start = reviews[-1].created_at.strftime("%Y-%m-%d") if reviews else "N/A"
-    time_range_end = reviews[0].created_at.strftime("%Y-%m-%d") if reviews else "N/A"
+    if request.args.get("detail") == "1":
+        return stream_csv(review_detail_rows(user.id), f"{user.username}_reviews.csv")
+    return send_cached_report("review_report", "csv", f"{user.username}_review_report.csv", user)
+
+def user_report_rows(user, total_reviews):
+    first_day, last_day = rollup_date_range(user.id)
+    time_range_start = first_day.strftime("%Y-%m-%d") if first_day else "N/A"
+    time_range_end = last_day.strftime("%Y-%m-%d") if last_day else "N/A"
 
     # Count sentiment
-    sentiment_counts = {"positive":0, "negative":0, "neutral":0}
-    for r in reviews:
-        label = r.sentiment_label.lower() if r.sentiment_label else "neutral"
-        if label in sentiment_counts:
-            sentiment_counts[label] += 1
+    sentiment_counts = rollup_sentiment_counts(user.id)
 
     # Aspect summary
-    aspect_summary = analyze_aspect_sentiment(reviews)
+    aspect_summary = analyze_aspect_sentiment(user.id)
     key_insights = {
         "positive": [a for a in aspect_summary if a["label"] == "Positive"],
         "negative": [a for a in aspect_summary if a["label"] == "Negative"]
     }
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
     # Dataset summary
-    writer.writerow(["Dataset Summary"])
-    writer.writerow(["Total Reviews", total_reviews])
-    writer.writerow(["Time Range", f"{time_range_start} to {time_range_end}"])
-    writer.writerow([])
+    yield ["Dataset Summary"]
+    yield ["Total Reviews", total_reviews]
+    yield ["Time Range", f"{time_range_start} to {time_range_end}"]
+    yield []
 
     # Sentiment distribution
-    writer.writerow(["Sentiment Distribution (Model Analysis)"])
+    yield ["Sentiment Distribution (Model Analysis)"]
     total = total_reviews if total_reviews > 0 else 1
     for sentiment, count in sentiment_counts.items():
         percent = (count / total) * 100
-        writer.writerow([sentiment.capitalize(), count, f"{percent:.1f}%"])
-    writer.writerow([])
+        yield [sentiment.capitalize(), count, f"{percent:.1f}%"]
+    yield []
 
     # Aspect highlights
-    writer.writerow(["Key Aspect Insights"])
+    yield ["Key Aspect Insights"]
     for a in aspect_summary:
-        writer.writerow([a["aspect"], a["label"], a["score"]])
-    writer.writerow([])
+        yield [a["aspect"], a["label"], a["score"]]
+    yield []
 
     # Key insights
-    writer.writerow(["Key Insights"])
-    writer.writerow(["Positive Aspects"])
+    yield ["Key Insights"]
+    yield ["Positive Aspects"]
     for a in key_insights["positive"]:
-        writer.writerow([a["aspect"], a["label"], a["score"]])
-    writer.writerow([])
-    writer.writerow(["Negative Aspects"])
+        yield [a["aspect"], a["label"], a["score"]]
+    yield []
+    yield ["Negative Aspects"]
     for a in key_insights["negative"]:
-        writer.writerow([a["aspect"], a["label"], a["score"]])
-
-    # Save CSV
-    output.seek(0)
-    mem = io.BytesIO()
-    mem.write(output.getvalue().encode('utf-8'))
-    mem.seek(0)
-    filename = f"{user.username}_review_report.csv"
-    return send_file(mem, mimetype='text/csv', download_name=filename, as_attachment=True)
+        yield [a["aspect"], a["label"], a["score"]]
 
 @app.route('/generate_pdf_report')
 def generate_pdf_report():
     if "user_id" not in session:
         return redirect(url_for("login"))
     user = User.query.get(session["user_id"])
-    reviews = Review.query.filter_by(user_id=user.id).order_by(Review.created_at).all()
-    if not reviews:
+    if not rollup_review_count(user.id):
         flash("No reviews to generate report.", "warning")
         return redirect(url_for("dashboard"))
 
-    total_reviews = len(reviews)
-    time_range_start = reviews[-1].created_at.strftime("%Y-%m-%d") if reviews else "N/A"
-    time_range_end = reviews[0].created_at.strftime("%Y-%m-%d") if reviews else "N/A"
+    return send_cached_report("review_report", "pdf", f"{user.username}_review_report.pdf", user)
+
+def render_user_pdf(user, total_reviews):
+    first_day, last_day = rollup_date_range(user.id)
+    time_range_start = first_day.strftime("%Y-%m-%d") if first_day else "N/A"
+    time_range_end = last_day.strftime("%Y-%m-%d") if last_day else "N/A"
 
     # Count sentiment
-    sentiment_counts = {"positive":0, "negative":0, "neutral":0}
-    for r in reviews:
-        label = r.sentiment_label.lower() if r.sentiment_label else "neutral"
-        if label in sentiment_counts:
-            sentiment_counts[label] += 1
+    sentiment_counts = rollup_sentiment_counts(user.id)
 
     # Aspect summary
-    aspect_summary = analyze_aspect_sentiment(reviews)
+    aspect_summary = analyze_aspect_sentiment(user.id)
     key_insights = {
         "positive": [a for a in aspect_summary if a["label"] == "Positive"],
         "negative": [a for a in aspect_summary if a["label"] == "Negative"]
@@ -1246,13 +2276,48 @@ def generate_pdf_report():
 
     c.showPage()
     c.save()
-    mem.seek(0)
-    filename = f"{user.username}_review_report.pdf"
-    return send_file(mem, mimetype='application/pdf', download_name=filename, as_attachment=True)
+    return mem.getvalue()
+
+# ==================== CLI commands ====================
+
+@app.cli.command("backfill-aspects")
+def backfill_aspects():
+    """Compute and store aspect results for reviews ingested before they were persisted."""
+    missing = Review.query.filter(~Review.aspect_results.any()).all()
+    entries = []
+    for chunk in chunked(missing, app.config["INGEST_CHUNK_SIZE"]):
+        aspect_results = analyze_aspect_sentiment_batch(
+            [review.text for review in chunk],
+            text_sentiments=[review_sentiment(review) for review in chunk]
+        )
+        for review, review_aspects in zip(chunk, aspect_results):
+            entries.append(dict(rollup_entry(review, store_review_aspects(review, review_aspects)), aspects_only=True))
+    update_rollups(entries)
+    db.session.commit()
+    print(f"Stored aspect results for {len(missing)} reviews.")
+
+@app.cli.command("rebuild-search-index")
+def rebuild_search_index_command():
+    """Recreate the FTS triggers if missing and reindex every review."""
+    ensure_review_fts(rebuild=True)
+    print("Rebuilt the review search index.")
+
+@app.cli.command("compact-system-logs")
+def compact_system_logs_command():
+    """Apply the SystemLog retention limits now."""
+    print(f"Deleted {compact_system_logs()} system log rows.")
+
+@app.cli.command("rebuild-rollups")
+def rebuild_rollups_command():
+    """Recompute the sentiment/aspect rollup tables from scratch."""
+    rebuild_rollups()
+    db.session.commit()
+    print("Rebuilt sentiment and aspect rollups.")
 
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
+        ensure_review_fts()
         # Seed default admin if not exists
         if not Admin.query.filter_by(username="admin").first():
             a = Admin(username="admin")
@@ -1269,5 +2334,12 @@ if __name__ == "__main__":
         db.session.commit()
         if AspectCategory.query.count() > 0:
             print("✅ Seeded default aspect categories.")
+
+    # The debug reloader's parent process only watches files; background threads belong in the serving child
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        ensure_models_warming_up()
+        ensure_ingest_resumed()
+        ensure_report_refresher_started()
+        stats_sampler.ensure_started()
             
     app.run(debug=True)
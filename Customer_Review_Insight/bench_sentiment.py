@@ -0,0 +1,72 @@
+"""
+Compare sentiment backends against the full-precision PyTorch model:
+label agreement, score drift, load time and throughput.
+
+    python bench_sentiment.py --backends pytorch,quantized,onnx [--csv reviews.csv] [--min-agreement 0.97]
+
+The CSV needs a `text` column (same format as the review upload).
+"""
+import argparse
+import csv
+import sys
+import time
+from utils.sentiment import load_backend, to_result, DEFAULT_BATCH_SIZE
+
+SAMPLE_TEXTS = [
+    "I love this fantastic product!",
+    "The battery died after two days, very disappointed.",
+    "Delivery was on time.",
+    "Camera quality is okay, nothing special.",
+    "Customer service never answered my emails. Terrible.",
+    "Great value for the price, would buy again.",
+    "It works as described.",
+    "The screen cracked within a week and the replacement took a month.",
+]
+
+def load_texts(path, limit):
+    if not path:
+        return SAMPLE_TEXTS * 25
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        texts = [row["text"] for row in csv.DictReader(f) if row.get("text")]
+    return texts[:limit]
+
+def score(pipe, texts, batch_size):
+    started = time.perf_counter()
+    outputs = pipe(texts, batch_size=batch_size, truncation=True)
+    return [to_result(raw) for raw in outputs], time.perf_counter() - started
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--backends", default="pytorch,quantized")
+parser.add_argument("--csv")
+parser.add_argument("--limit", type=int, default=2000)
+parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+parser.add_argument("--min-agreement", type=float, default=None)
+args = parser.parse_args()
+
+texts = load_texts(args.csv, args.limit)
+backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+if "pytorch" not in backends:
+    backends.insert(0, "pytorch")   # reference for the parity check
+
+reference = None
+failed = False
+print(f"{len(texts)} texts, batch size {args.batch_size}\n")
+print(f"{'backend':>10} {'load s':>8} {'texts/s':>9} {'agreement':>10} {'max |Δscore|':>13}")
+for name in backends:
+    started = time.perf_counter()
+    pipe = load_backend(name)
+    load_seconds = time.perf_counter() - started
+    score(pipe, texts[:args.batch_size], args.batch_size)   # warm-up
+    results, seconds = score(pipe, texts, args.batch_size)
+    if reference is None:
+        reference = results
+    same = [(a, b) for a, b in zip(reference, results) if a["label"] == b["label"]]
+    agreement = len(same) / len(texts)
+    drift = max((abs(a["score"] - b["score"]) for a, b in same), default=0.0)
+    print(f"{name:>10} {load_seconds:8.1f} {len(texts) / seconds:9.1f} {agreement:10.2%} {drift:13.4f}")
+    if args.min_agreement is not None and agreement < args.min_agreement:
+        failed = True
+
+if failed:
+    print(f"\n❌ A backend agreed with pytorch on fewer than {args.min_agreement:.0%} of labels.")
+    sys.exit(1)
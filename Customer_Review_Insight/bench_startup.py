@@ -0,0 +1,49 @@
+"""
+Startup benchmark: time to import the app (what every `flask` command and
+server start pays) and time/RSS to load the models on first use.
+
+    python bench_startup.py [--runs 3] [--max-import-seconds 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+PROBE = r"""
+import json, time, psutil
+proc = psutil.Process()
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+rss_import = proc.memory_info().rss
+app.warm_up_models()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_seconds": t1 - t0,
+    "warm_up_seconds": t2 - t1,
+    "rss_after_import_mb": rss_import / 2**20,
+    "rss_after_warm_up_mb": proc.memory_info().rss / 2**20,
+}))
+"""
+
+def run_once():
+    # Fresh interpreter each run so nothing is already imported
+    out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--runs", type=int, default=3)
+parser.add_argument("--max-import-seconds", type=float, default=None)
+args = parser.parse_args()
+
+results = [run_once() for _ in range(args.runs)]
+for key in results[0]:
+    values = sorted(r[key] for r in results)
+    print(f"{key:>22}: min {values[0]:8.2f}  median {values[len(values) // 2]:8.2f}  max {values[-1]:8.2f}")
+
+if args.max_import_seconds is not None:
+    slowest = max(r["import_seconds"] for r in results)
+    if slowest > args.max_import_seconds:
+        print(f"❌ App import took {slowest:.2f}s (budget {args.max_import_seconds:.2f}s)")
+        sys.exit(1)
+    print("✅ App import within budget.")
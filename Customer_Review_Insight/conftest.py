@@ -0,0 +1,6 @@
+"""Point the app at a throwaway database before any test module imports it."""
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_PATH", os.path.join(tempfile.mkdtemp(), "reviews.db"))
+os.environ.setdefault("WARM_UP_MODELS", "0")
@@ -0,0 +1,107 @@
+"""
+Standalone sentiment inference server. Holds the model in a fixed pool of
+worker processes so Flask workers can scale without each loading their own
+copy; point them at it with INFERENCE_SERVER_URL=http://127.0.0.1:8765.
+
+    python inference_server.py [--port 8765] [--workers 2]
+
+POST /sentiment  {"texts": [...]}  ->  {"results": [{label, score}, ...], "model_version": ...}
+GET  /health
+"""
+import argparse
+import json
+import multiprocessing
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.batching import MicroBatcher
+from utils.sentiment import load_backend, to_result, DEFAULT_BATCH_SIZE, MODEL_VERSION, SENTIMENT_BACKEND
+
+# --- Model worker processes ---
+_pipe = None
+
+def _init_worker(backend, threads):
+    global _pipe
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    _pipe = load_backend(backend)
+
+def _score_in_worker(texts):
+    # Length-sorted so each padded batch holds similarly sized texts
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    outputs = _pipe([texts[i] for i in order], batch_size=DEFAULT_BATCH_SIZE, truncation=True)
+    results = [None] * len(texts)
+    for i, raw in zip(order, outputs):
+        results[i] = to_result(raw)
+    return results
+
+# --- HTTP front end ---
+class InferenceHandler(BaseHTTPRequestHandler):
+    batcher = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"error": "Not found"})
+        self._send_json(200, {"status": "ok", "model_version": MODEL_VERSION, "queue_depth": self.batcher.queue_depth()})
+
+    def do_POST(self):
+        if self.path != "/sentiment":
+            return self._send_json(404, {"error": "Not found"})
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            texts = payload["texts"]
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return self._send_json(400, {"error": "Expected JSON body {\"texts\": [str, ...]}"})
+        try:
+            # Each text is queued on its own so concurrent requests share batches
+            results = [future.result() for future in self.batcher.submit_many(texts)]
+        except Exception as exc:
+            return self._send_json(500, {"error": str(exc)})
+        self._send_json(200, {"results": results, "model_version": MODEL_VERSION})
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=os.environ.get("INFERENCE_SERVER_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("INFERENCE_SERVER_PORT", 8765)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("INFERENCE_WORKERS", 2)))
+    parser.add_argument("--threads-per-worker", type=int, default=int(os.environ.get("INFERENCE_THREADS_PER_WORKER", 0)))
+    parser.add_argument("--max-batch-size", type=int, default=int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", 64)))
+    parser.add_argument("--max-delay-ms", type=float, default=float(os.environ.get("INFERENCE_MAX_DELAY_MS", 5)))
+    args = parser.parse_args()
+
+    # spawn: workers start clean instead of inheriting a forked, threaded parent
+    pool = multiprocessing.get_context("spawn").Pool(
+        args.workers, initializer=_init_worker, initargs=(SENTIMENT_BACKEND, args.threads_per_worker)
+    )
+    # Block until the workers have loaded the model before accepting traffic
+    pool.map(_score_in_worker, [["Warm-up."]] * args.workers, chunksize=1)
+
+    InferenceHandler.batcher = MicroBatcher(
+        lambda texts: pool.apply(_score_in_worker, (texts,)),
+        max_batch_size=args.max_batch_size,
+        max_delay=args.max_delay_ms / 1000,
+        concurrency=args.workers,
+        name="inference-batcher"
+    )
+    server = ThreadingHTTPServer((args.host, args.port), InferenceHandler)
+    print(f"✅ Inference server ({MODEL_VERSION}) on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    finally:
+        pool.terminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Add FTS5 full-text index over review text
+
+Revision ID: e4b7c1d9a2f6
+Revises: 8a41c6d2e9f3
+Create Date: 2026-10-17 12:40:12.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7c1d9a2f6'
+down_revision = '8a41c6d2e9f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other backends have no search index
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE review_fts USING fts5("
+        "text, cleaned, content='review', content_rowid='id', tokenize='porter unicode61')"
+    )
+    op.execute(
+        "CREATE TRIGGER review_fts_ai AFTER INSERT ON review BEGIN "
+        "INSERT INTO review_fts(rowid, text, cleaned) VALUES (new.id, new.text, new.cleaned); END"
+    )
+    op.execute(
+        "CREATE TRIGGER review_fts_ad AFTER DELETE ON review BEGIN "
+        "INSERT INTO review_fts(review_fts, rowid, text, cleaned) VALUES ('delete', old.id, old.text, old.cleaned); END"
+    )
+    op.execute(
+        "CREATE TRIGGER review_fts_au AFTER UPDATE OF text, cleaned ON review BEGIN "
+        "INSERT INTO review_fts(review_fts, rowid, text, cleaned) VALUES ('delete', old.id, old.text, old.cleaned); "
+        "INSERT INTO review_fts(rowid, text, cleaned) VALUES (new.id, new.text, new.cleaned); END"
+    )
+    # Index the reviews that already exist
+    op.execute("INSERT INTO review_fts(review_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS review_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS review_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS review_fts_ai")
+    op.execute("DROP TABLE IF EXISTS review_fts")
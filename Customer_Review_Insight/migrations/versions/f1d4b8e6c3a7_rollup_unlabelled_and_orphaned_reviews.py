@@ -0,0 +1,42 @@
+"""Count unlabelled and orphaned reviews in the rollups
+
+Revision ID: f1d4b8e6c3a7
+Revises: e8c2f6a4b0d9
+Create Date: 2026-10-17 18:05:51.630274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1d4b8e6c3a7'
+down_revision = 'e8c2f6a4b0d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Reviews without a sentiment go in an 'unlabelled' bucket and reviews
+    # of deleted users under user_id 0; neither had rollup rows before
+    op.execute(
+        "INSERT INTO sentiment_rollup (user_id, day, label, total, score_sum) "
+        "SELECT coalesce(user_id, 0), date(created_at), coalesce(lower(sentiment_label), 'unlabelled'), "
+        "count(id), coalesce(sum(sentiment_score), 0) "
+        "FROM review WHERE user_id IS NULL OR sentiment_label IS NULL "
+        "GROUP BY coalesce(user_id, 0), date(created_at), coalesce(lower(sentiment_label), 'unlabelled')"
+    )
+    op.execute(
+        "INSERT INTO aspect_rollup (user_id, day, aspect, label, total, score_sum) "
+        "SELECT 0, date(r.created_at), a.aspect, lower(a.label), count(a.id), coalesce(sum(a.score), 0) "
+        "FROM review_aspect a JOIN review r ON r.id = a.review_id WHERE r.user_id IS NULL "
+        "GROUP BY date(r.created_at), a.aspect, lower(a.label)"
+    )
+    # Cached reports were rendered from the old totals
+    op.execute("UPDATE rollup_version SET version = version + 1")
+
+
+def downgrade():
+    op.execute("DELETE FROM sentiment_rollup WHERE user_id = 0 OR label = 'unlabelled'")
+    op.execute("DELETE FROM aspect_rollup WHERE user_id = 0")
+    op.execute("UPDATE rollup_version SET version = version + 1")
@@ -0,0 +1,69 @@
+"""
+Aspect sentiment from matcher spans. A blank English pipeline with a
+sentencizer stands in for en_core_web_sm, and sentiment is a keyword
+lookup, so these run without model downloads.
+"""
+import pytest
+import spacy
+
+import app as app_module
+import utils.nlp
+from app import analyze_aspect_sentiment_batch
+from utils.aspects import AspectMatcher
+from utils.highlight import highlight_aspects
+from utils.lazy import LazyLoader
+
+def keyword_sentiment(texts):
+    results = []
+    for text in texts:
+        lowered = text.lower()
+        if "great" in lowered:
+            results.append({"label": "positive", "score": 0.9})
+        elif "bad" in lowered:
+            results.append({"label": "negative", "score": 0.8})
+        else:
+            results.append({"label": "neutral", "score": 0.5})
+    return results
+
+@pytest.fixture
+def aspects(monkeypatch):
+    def blank_pipeline():
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        return nlp
+    monkeypatch.setattr(utils.nlp, "_nlp", LazyLoader(blank_pipeline))
+    monkeypatch.setattr(app_module, "analyze_sentiment_batch", keyword_sentiment)
+
+    def analyze(categories, *texts):
+        matcher = AspectMatcher(categories)
+        monkeypatch.setattr(app_module, "get_aspect_matcher", lambda: matcher)
+        return analyze_aspect_sentiment_batch(list(texts))
+    return analyze
+
+def by_aspect(results):
+    return {r["aspect"]: r for r in results}
+
+def test_capitalised_category_takes_its_own_sentence(aspects):
+    [results] = aspects(["Camera", "Battery"], "The camera is great. The battery is bad.")
+    found = by_aspect(results)
+    assert found["Camera"]["label"] == "Positive"
+    assert found["Battery"]["label"] == "Negative"
+
+def test_partial_words_do_not_pick_the_sentence(aspects):
+    text = "The cameraman was bad. The camera is great."
+    [results] = aspects(["camera"], text)
+    [camera] = results
+    assert camera["label"] == "Positive"
+    start = text.rindex("The camera") + 4
+    assert camera["spans"] == [[start, start + len("camera")]]
+
+def test_spans_stay_in_the_sentence_that_set_the_label(aspects):
+    text = "The camera is great. Sadly the camera strap is bad."
+    [results] = aspects(["camera"], text)
+    [camera] = results
+    assert camera["label"] == "Positive"
+    start = text.index("camera")
+    assert camera["spans"] == [[start, start + len("camera")]]
+    html = str(highlight_aspects(text, results))
+    assert html.count("<span") == 1
+    assert html.index("<span") < text.index("Sadly")
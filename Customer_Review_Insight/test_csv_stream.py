@@ -0,0 +1,55 @@
+"""Block-wise CSV decoding in utils.csv_stream, across every block boundary."""
+import csv
+import io
+
+import pytest
+
+from utils.csv_stream import iter_text_lines, iter_csv_rows
+
+BLOCK_SIZES = [1, 2, 3, 5, 7, 64, 64 * 1024]
+
+def lines(data, read_size, **kwargs):
+    return list(iter_text_lines(io.BytesIO(data), read_size, **kwargs))
+
+@pytest.mark.parametrize("read_size", BLOCK_SIZES)
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_lines_split_on_every_line_ending(newline, read_size):
+    text = newline.join(["text,rating", "one,1", "two,2"]) + newline
+    assert lines(text.encode(), read_size) == [f"text,rating{newline}", f"one,1{newline}", f"two,2{newline}"]
+
+@pytest.mark.parametrize("read_size", BLOCK_SIZES)
+def test_mixed_line_endings_and_missing_final_newline(read_size):
+    assert lines(b"a\r\nb\rc\nd", read_size) == ["a\r\n", "b\r", "c\n", "d"]
+
+@pytest.mark.parametrize("read_size", BLOCK_SIZES)
+def test_blank_lines_between_cr_endings_are_kept(read_size):
+    assert lines(b"a\r\r\nb\r\r", read_size) == ["a\r", "\r\n", "b\r", "\r"]
+
+@pytest.mark.parametrize("read_size", BLOCK_SIZES)
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_rows_match_csv_module(newline, read_size):
+    text = newline.join(["text,rating", '"spans' + newline + 'two lines",5', "plain,3"]) + newline
+    expected = list(csv.DictReader(io.StringIO(text, newline="")))
+    assert list(iter_csv_rows(io.BytesIO(text.encode()), read_size)) == expected
+
+@pytest.mark.parametrize("read_size", BLOCK_SIZES)
+def test_bom_is_dropped(read_size):
+    rows = list(iter_csv_rows(io.BytesIO(b"\xef\xbb\xbftext,rating\r\nok,4\r\n"), read_size))
+    assert rows == [{"text": "ok", "rating": "4"}]
+
+@pytest.mark.parametrize("read_size", BLOCK_SIZES)
+def test_multibyte_characters_split_across_blocks(read_size):
+    assert lines("café ☕\n张伟\n".encode("utf-8"), read_size) == ["café ☕\n", "张伟\n"]
+
+@pytest.mark.parametrize("read_size", BLOCK_SIZES)
+def test_invalid_bytes_become_replacement_characters(read_size):
+    assert lines(b"ok\nbad \xff\xfe byte\n", read_size) == ["ok\n", "bad \ufffd\ufffd byte\n"]
+
+@pytest.mark.parametrize("data", [b"x" * 5000, b"short\n" + b"y" * 5000 + b"\n", b"\r".join([b"z" * 5000] * 3)])
+def test_overlong_line_raises(data):
+    with pytest.raises(ValueError, match="longer than 1000"):
+        lines(data, 100, max_line_length=1000)
+
+def test_cr_only_file_streams_without_buffering_everything():
+    data = b"text,rating\r" + b"row,1\r" * 10000
+    assert len(lines(data, 64, max_line_length=100)) == 10001
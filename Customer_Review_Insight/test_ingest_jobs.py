@@ -0,0 +1,115 @@
+"""
+Background CSV ingestion: jobs are claimed atomically, resume from
+rows_processed, and a job whose every chunk failed keeps its file.
+The model-backed ingest_csv_rows is replaced so these run without models.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+from app import app, db, IngestJob, User, INGEST_DIR, run_ingest_job, resume_ingest_jobs
+
+CSV = "text,rating\n" + "".join(f"Review number {i},{1 + i % 5}\n" for i in range(6))
+
+@pytest.fixture
+def ingested(monkeypatch):
+    """Reset the database and record the rows each ingest_csv_rows call receives."""
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="alice", email="alice@example.com")
+        user.set_password("secret")
+        db.session.add(user)
+        db.session.commit()
+    calls = []
+    lock = threading.Lock()
+
+    def fake_ingest(rows, resolve_user_id):
+        with lock:
+            calls.append([row["text"] for row in rows])
+        return len(rows)
+
+    monkeypatch.setattr(app_module, "ingest_csv_rows", fake_ingest)
+    monkeypatch.setitem(app.config, "INGEST_CHUNK_SIZE", 2)
+    yield calls
+    with app.app_context():
+        db.session.remove()
+
+@pytest.fixture
+def executor(monkeypatch):
+    """A private ingest pool, so a test can wait for the jobs it resumed."""
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(app_module, "ingest_executor", pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+def make_job(job_id, status="queued", rows_processed=0, heartbeat_at=None, text=CSV):
+    path = os.path.join(INGEST_DIR, f"{job_id}.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    with app.app_context():
+        db.session.add(IngestJob(
+            id=job_id, user_id=1, file_path=path, status=status,
+            rows_processed=rows_processed, heartbeat_at=heartbeat_at
+        ))
+        db.session.commit()
+    return path
+
+def load_job(job_id):
+    with app.app_context():
+        job = db.session.get(IngestJob, job_id)
+        db.session.expunge(job)
+        return job
+
+def rows_seen(calls):
+    return [text for chunk in calls for text in chunk]
+
+def test_concurrent_runs_process_a_job_once(ingested):
+    make_job("claimed")
+    threads = [threading.Thread(target=run_ingest_job, args=("claimed",)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(rows_seen(ingested)) == 6
+    job = load_job("claimed")
+    assert (job.status, job.rows_processed, job.reviews_added) == ("completed", 6, 6)
+    assert not os.path.exists(job.file_path)
+
+def test_finished_job_is_not_run_again(ingested):
+    make_job("done", status="completed", rows_processed=6)
+    run_ingest_job("done")
+    assert ingested == []
+
+def test_resume_skips_committed_rows(ingested, executor):
+    make_job("resumed", status="running", rows_processed=4, heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+    with app.app_context():
+        resume_ingest_jobs()
+    executor.shutdown(wait=True)
+    assert rows_seen(ingested) == ["Review number 4", "Review number 5"]
+    job = load_job("resumed")
+    assert (job.status, job.rows_processed) == ("completed", 6)
+
+def test_resume_leaves_live_jobs_alone(ingested, executor):
+    make_job("live", status="running", rows_processed=2, heartbeat_at=datetime.utcnow())
+    with app.app_context():
+        resume_ingest_jobs()
+    executor.shutdown(wait=True)
+    assert ingested == []
+    assert load_job("live").status == "running"
+
+def test_job_with_every_chunk_failing_is_failed_and_kept(ingested, monkeypatch):
+    def failing_ingest(rows, resolve_user_id):
+        raise ValueError("bad chunk")
+    monkeypatch.setattr(app_module, "ingest_csv_rows", failing_ingest)
+    path = make_job("broken")
+    run_ingest_job("broken")
+    job = load_job("broken")
+    assert job.status == "failed"
+    assert job.error_count == 6 and job.rows_processed == 0
+    assert os.path.exists(path)
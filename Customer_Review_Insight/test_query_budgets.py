@@ -0,0 +1,93 @@
+"""
+Request the dashboards and review APIs with TESTING on, so an endpoint that
+issues more SQL statements than its QUERY_BUDGETS entry raises
+QueryBudgetExceeded and fails the test. The budgets equal the measured
+counts and there are more users and reviews than that, so any per-row
+query (an N+1) pushes an endpoint over.
+
+    python -m pytest test_query_budgets.py
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import (app, db, Admin, User, Review, ReviewAspect, AspectCategory, ensure_review_fts,
+                 rebuild_rollups, MODEL_VERSION)
+
+USERS = 20
+REVIEWS_PER_USER = 8
+
+@pytest.fixture(scope="module")
+def seeded():
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        ensure_review_fts(rebuild=True)
+        admin = Admin(username="admin")
+        admin.set_password("admin")
+        db.session.add(admin)
+        for name in ["battery", "camera", "delivery time"]:
+            db.session.add(AspectCategory(name=name))
+        now = datetime.utcnow()
+        for u in range(USERS):
+            user = User(username=f"user{u}", email=f"user{u}@example.com")
+            user.set_password("secret")
+            db.session.add(user)
+            for r in range(REVIEWS_PER_USER):
+                label = ["Positive", "Negative", "Neutral"][r % 3]
+                text = f"The battery is fine and the camera works, review {r}."
+                review = Review(
+                    user=user, text=text, rating=1 + r % 5, created_at=now - timedelta(days=r),
+                    sentiment_label=label, sentiment_score=0.9, original_text=text,
+                    cleaned=text, tokenized=text, processed=text.lower()
+                )
+                review.aspect_results.append(ReviewAspect(
+                    aspect="battery", label=label, score=0.8, model_version=MODEL_VERSION,
+                    spans=json.dumps([[4, 11]])
+                ))
+                db.session.add(review)
+        db.session.commit()
+        rebuild_rollups()
+        db.session.commit()
+        review_id = Review.query.join(User).filter(User.username == "user0").first().id
+    yield review_id
+    with app.app_context():
+        db.session.remove()
+
+@pytest.fixture
+def user_client(seeded):
+    client = app.test_client()
+    client.post("/login", data={"email": "user0@example.com", "password": "secret"})
+    return client
+
+@pytest.fixture
+def admin_client(seeded):
+    client = app.test_client()
+    client.post("/admin_login", data={"username": "admin", "password": "admin"})
+    return client
+
+@pytest.mark.parametrize("path, endpoint", [
+    ("/dashboard", "dashboard"),
+    ("/api/reviews?limit=5", "list_user_reviews"),
+    ("/api/reviews/search?q=battery", "search_reviews_api"),
+])
+def test_user_endpoints_within_budget(user_client, path, endpoint):
+    response = user_client.get(path)
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) <= app.config["QUERY_BUDGETS"][endpoint]
+
+def test_review_details_within_budget(user_client, seeded):
+    response = user_client.get(f"/api/reviews/{seeded}/details")
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) <= app.config["QUERY_BUDGETS"]["get_review_details"]
+
+@pytest.mark.parametrize("path, endpoint", [
+    ("/admin_dashboard", "admin_dashboard"),
+    ("/api/admin/reviews?limit=5", "list_admin_reviews"),
+])
+def test_admin_endpoints_within_budget(admin_client, path, endpoint):
+    response = admin_client.get(path)
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) <= app.config["QUERY_BUDGETS"][endpoint]
@@ -0,0 +1,62 @@
+"""
+Report data versions: reports are queued for re-rendering only once the
+change that made them stale has committed, and a rename advances the
+version of every report that prints the username.
+"""
+import pytest
+
+import app as app_module
+from app import app, db, User, RollupVersion, SYSTEM_SCOPE, bump_rollup_versions, mark_reports_stale
+
+@pytest.fixture
+def users():
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for name in ["alice", "bob"]:
+            user = User(username=name, email=f"{name}@example.com")
+            user.set_password("secret")
+            db.session.add(user)
+        db.session.commit()
+        ids = {user.username: user.id for user in User.query.all()}
+    app_module._stale_report_scopes.clear()
+    yield ids
+    app_module._stale_report_scopes.clear()
+    with app.app_context():
+        db.session.remove()
+
+def versions(*scopes):
+    with app.app_context():
+        return [getattr(db.session.get(RollupVersion, scope), "version", 0) for scope in scopes]
+
+def test_reports_are_queued_on_commit(users):
+    with app.app_context():
+        bump_rollup_versions([users["alice"]])
+        mark_reports_stale([users["alice"]])
+        assert not app_module._stale_report_scopes
+        db.session.commit()
+    assert app_module._stale_report_scopes == {users["alice"]}
+
+def test_rolled_back_changes_queue_nothing(users):
+    with app.app_context():
+        bump_rollup_versions([users["alice"]])
+        mark_reports_stale([users["alice"]])
+        db.session.rollback()
+        db.session.commit()
+    assert not app_module._stale_report_scopes
+
+def test_rename_advances_report_versions(users):
+    client = app.test_client()
+    client.post("/login", data={"email": "alice@example.com", "password": "secret"})
+    before = versions(users["alice"], SYSTEM_SCOPE)
+
+    response = client.post("/update_profile", json={"username": "bob", "email": "alice@example.com"})
+    assert response.status_code == 409
+    assert versions(users["alice"], SYSTEM_SCOPE) == before
+    assert not app_module._stale_report_scopes
+
+    response = client.post("/update_profile", json={"username": "alicia", "email": "alice@example.com"})
+    assert response.status_code == 200
+    assert versions(users["alice"], SYSTEM_SCOPE) == [v + 1 for v in before]
+    assert app_module._stale_report_scopes == {users["alice"]}
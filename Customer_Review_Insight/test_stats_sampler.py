@@ -0,0 +1,51 @@
+"""
+Server stats sampling: windows are cut by the time each point was taken,
+and the endpoint reports warming up instead of measuring on the request
+thread before the sampler's first interval has elapsed.
+"""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import app as app_module
+import utils.stats_sampler
+from app import app
+from utils.stats_sampler import StatsSampler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(utils.stats_sampler, "time", SimpleNamespace(monotonic=clock, sleep=time.sleep))
+    return clock
+
+def test_window_filters_by_sample_time(clock):
+    sampler = StatsSampler(interval=5, probes={"n": lambda: clock.now})
+    for offset in [0, 5, 10, 300, 305]:
+        clock.now = 1000.0 + offset
+        sampler.sample()
+    clock.now = 1000.0 + 310
+    assert [p["n"] for p in sampler.window(60)] == [1300.0, 1305.0]
+    # A gap in sampling shortens the window rather than pulling in older points
+    assert [p["n"] for p in sampler.window(15)] == [1300.0, 1305.0]
+    assert [p["n"] for p in sampler.window(3600)] == [1000.0, 1005.0, 1010.0, 1300.0, 1305.0]
+    clock.now = 1000.0 + 400
+    assert sampler.window(60) == []
+
+def test_endpoint_reports_warming_up_without_sampling(monkeypatch):
+    sampler = StatsSampler(interval=5)
+    monkeypatch.setattr(sampler, "ensure_started", lambda: None)
+    monkeypatch.setattr(sampler, "sample", lambda: pytest.fail("sampled on the request thread"))
+    monkeypatch.setattr(app_module, "stats_sampler", sampler)
+    client = app.test_client()
+    assert client.get("/api/system_monitoring/server_stats?window=60").get_json() == {
+        "interval": 5, "points": [], "warming_up": True
+    }
+    assert client.get("/api/system_monitoring/server_stats").get_json() == {"warming_up": True}
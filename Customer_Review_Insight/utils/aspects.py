@@ -0,0 +1,32 @@
+from utils.nlp import get_nlp
+
+class AspectMatcher:
+    """
+    Predefined aspect categories compiled into a single spaCy PhraseMatcher
+    (case-insensitive, token aligned). Matching is one pass over a Doc no
+    matter how many categories are loaded.
+    """
+
+    def __init__(self, names):
+        from spacy.matcher import PhraseMatcher
+        nlp = get_nlp()
+        self.vocab = nlp.vocab
+        self.names = list(names)
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        for name in self.names:
+            # Each category is its own match key so hits map back to the stored name
+            self.matcher.add(name, [nlp.make_doc(name)])
+
+    def __len__(self):
+        return len(self.names)
+
+    def find(self, doc):
+        """Return (aspect name, start_char, end_char) for every match in the Doc."""
+        return [
+            (self.vocab.strings[match_id], doc[start:end].start_char, doc[start:end].end_char)
+            for match_id, start, end in self.matcher(doc)
+        ]
+
+    def match(self, doc):
+        """Return the distinct category names found in the Doc."""
+        return list(dict.fromkeys(name for name, _, _ in self.find(doc)))
@@ -0,0 +1,123 @@
+import queue
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Histogram bucket upper bounds; the last bucket catches everything above
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+def _bucket_counts(bounds):
+    return {f"<={bound}": 0 for bound in bounds} | {f">{bounds[-1]}": 0}
+
+def _observe(counts, bounds, value):
+    i = bisect_left(bounds, value)
+    counts[f"<={bounds[i]}" if i < len(bounds) else f">{bounds[-1]}"] += 1
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+class MicroBatcher:
+    """
+    Coalesce items submitted from many threads into batches for one call to
+    `fn(items) -> results`. A batch is dispatched when it reaches
+    `max_batch_size` or when its oldest item has waited `max_delay` seconds.
+    At most `concurrency` batches run at once; while they are all busy, new
+    items keep accumulating so the next batch is larger.
+
+    Per-item latency (submit to result) and batch sizes are recorded for
+    `stats()`; percentiles use the last `latency_window` items.
+    """
+
+    def __init__(self, fn, max_batch_size=32, max_delay=0.005, concurrency=1, name="micro-batcher",
+                 latency_window=5000):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=name)
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._latency_histogram = _bucket_counts(LATENCY_BUCKETS_MS)
+        self._batch_size_histogram = _bucket_counts(BATCH_SIZE_BUCKETS)
+        self.items = 0
+        self.batches = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def submit_many(self, items):
+        """Queue several items; returns their futures in input order."""
+        return [self.submit(item) for item in items]
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_delay_ms": self.max_delay * 1000,
+                "queue_depth": self.queue_depth(),
+                "items": self.items,
+                "batches": self.batches,
+                "errors": self.errors,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+                "latency_ms": {f"p{pct}": percentile(latencies, pct) for pct in (50, 95, 99)},
+                "latency_histogram_ms": dict(self._latency_histogram),
+                "batch_size_histogram": dict(self._batch_size_histogram),
+            }
+
+    def _record(self, batch, failed):
+        finished = time.perf_counter()
+        with self._stats_lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.errors += len(batch) if failed else 0
+            _observe(self._batch_size_histogram, BATCH_SIZE_BUCKETS, len(batch))
+            for _, _, submitted in batch:
+                latency_ms = round((finished - submitted) * 1000, 2)
+                self._latencies.append(latency_ms)
+                _observe(self._latency_histogram, LATENCY_BUCKETS_MS, latency_ms)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            self._slots.acquire()
+            batch = self._collect()
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch):
+        try:
+            results = self.fn([item for item, _, _ in batch])
+            self._record(batch, failed=False)
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as exc:
+            self._record(batch, failed=True)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            self._slots.release()
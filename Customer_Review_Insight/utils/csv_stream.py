@@ -0,0 +1,42 @@
+import codecs
+import csv
+import re
+
+READ_SIZE = 64 * 1024
+# Longest single line accepted before the upload is rejected
+MAX_LINE_LENGTH = 10 * 1024 * 1024
+
+_LINE_END = re.compile(r"\r\n|\r|\n")
+
+def iter_text_lines(stream, read_size: int = READ_SIZE, max_line_length: int = MAX_LINE_LENGTH):
+    """
+    Decode a binary stream as UTF-8 a block at a time and yield its lines,
+    split on CRLF, CR or LF (line endings kept, so quoted multi-line CSV
+    fields survive). A leading BOM is dropped and invalid byte sequences
+    become U+FFFD instead of aborting the upload. Only one block plus one
+    partial line is held in memory at any time; a line longer than
+    `max_line_length` raises ValueError.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    while True:
+        block = stream.read(read_size)
+        pending += decoder.decode(block, final=not block)
+        if not block:
+            if pending:
+                yield pending
+            return
+        start = 0
+        for match in _LINE_END.finditer(pending):
+            # A trailing CR may be the first half of a CRLF split across blocks
+            if match.group() == "\r" and match.end() == len(pending):
+                break
+            yield pending[start:match.end()]
+            start = match.end()
+        pending = pending[start:]
+        if len(pending) > max_line_length:
+            raise ValueError(f"CSV line longer than {max_line_length} characters")
+
+def iter_csv_rows(stream, read_size: int = READ_SIZE):
+    """Lazily yield csv.DictReader rows from a binary upload stream."""
+    return csv.DictReader(iter_text_lines(stream, read_size))
@@ -0,0 +1,33 @@
+from markupsafe import escape
+
+LABEL_CLASSES = {
+    "Positive": "highlight-positive",
+    "Negative": "highlight-negative",
+    "Neutral": "highlight-neutral"
+}
+
+def highlight_aspects(text: str, aspects) -> str:
+    """
+    HTML for `text` with every aspect occurrence wrapped in a span coloured by
+    its label. Works from the stored character offsets ({"spans": [[start,
+    end], ...]}) in one pass: overlapping spans keep the earliest (then
+    longest) one, text is escaped, and the output is joined once.
+    """
+    spans = sorted(
+        (
+            (start, end, LABEL_CLASSES.get(a["label"], "highlight-neutral"))
+            for a in aspects
+            for start, end in a.get("spans") or ()
+        ),
+        key=lambda span: (span[0], -span[1])
+    )
+    parts = []
+    pos = 0
+    for start, end, css_class in spans:
+        if start < pos or end > len(text):
+            continue
+        parts.append(escape(text[pos:start]))
+        parts.append(f"<span class='{css_class}'>{escape(text[start:end])}</span>")
+        pos = end
+    parts.append(escape(text[pos:]))
+    return "".join(parts)
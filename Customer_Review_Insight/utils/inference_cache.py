@@ -0,0 +1,134 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+def cache_key(text: str, model_version: str) -> str:
+    """Hash of the whitespace-normalized text, scoped to a model version."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{model_version}\x00{normalized}".encode("utf-8")).hexdigest()
+
+class InferenceCache:
+    """
+    Two-tier cache of model results keyed by (normalized text hash, model
+    version): an in-process LRU in front of a SQLite table that is shared by
+    every process on the box. The SQLite tier is trimmed to `max_disk_items`
+    rows, least recently used first.
+    """
+
+    # Inserted rows between size checks, so COUNT(*) isn't run on every write
+    EVICT_CHECK_EVERY = 1000
+
+    def __init__(self, path, max_memory_items=10000, max_disk_items=500000):
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes_since_evict = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS inference_cache ("
+                "key TEXT PRIMARY KEY, label TEXT NOT NULL, score REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_inference_cache_last_used ON inference_cache (last_used)")
+        return self._conn
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """Return a list aligned with `keys`: the cached result or None."""
+        results = [None] * len(keys)
+        with self._lock:
+            missing = {}
+            for i, key in enumerate(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    results[i] = self._memory[key]
+                    self.memory_hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+            if missing:
+                conn = self._connection()
+                found = {}
+                unique_keys = list(missing)
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(unique_keys), 500):
+                    batch = unique_keys[start:start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    for key, label, score in conn.execute(
+                        f"SELECT key, label, score FROM inference_cache WHERE key IN ({placeholders})", batch
+                    ):
+                        found[key] = {"label": label, "score": score}
+                if found:
+                    now = time.time()
+                    conn.executemany("UPDATE inference_cache SET last_used = ? WHERE key = ?", [(now, k) for k in found])
+                    conn.commit()
+                for key, positions in missing.items():
+                    result = found.get(key)
+                    if result is None:
+                        self.misses += len(positions)
+                        continue
+                    self._remember(key, result)
+                    self.disk_hits += len(positions)
+                    for i in positions:
+                        results[i] = result
+        return results
+
+    def put_many(self, items):
+        """Store (key, result) pairs in both tiers."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, result in items:
+                self._remember(key, result)
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO inference_cache (key, label, score, last_used) VALUES (?, ?, ?, ?)",
+                [(key, r["label"], r["score"], now) for key, r in items]
+            )
+            self._writes_since_evict += len(items)
+            if self._writes_since_evict >= self.EVICT_CHECK_EVERY:
+                self._evict(conn)
+                self._writes_since_evict = 0
+            conn.commit()
+
+    def _evict(self, conn):
+        (count,) = conn.execute("SELECT COUNT(*) FROM inference_cache").fetchone()
+        if count > self.max_disk_items:
+            conn.execute(
+                "DELETE FROM inference_cache WHERE key IN "
+                "(SELECT key FROM inference_cache ORDER BY last_used LIMIT ?)",
+                (count - self.max_disk_items,)
+            )
+
+    def stats(self):
+        with self._lock:
+            disk_items = self._connection().execute("SELECT COUNT(*) FROM inference_cache").fetchone()[0]
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0,
+                "memory_items": len(self._memory),
+                "disk_items": disk_items,
+                "max_memory_items": self.max_memory_items,
+                "max_disk_items": self.max_disk_items
+            }
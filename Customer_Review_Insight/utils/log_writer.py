@@ -0,0 +1,104 @@
+import queue
+import threading
+import time
+
+class BufferedWriter:
+    """
+    Bounded in-memory queue drained by one background thread, which hands
+    rows to `write_batch(rows)` in groups of up to `batch_size` so each
+    group costs a single transaction. When the queue is full, submit()
+    drops the row and counts it instead of blocking the caller. Every
+    `maintenance_interval` seconds the same thread also runs
+    `maintenance()` (e.g. retention cleanup), so the writes never contend
+    with each other.
+    """
+
+    def __init__(self, write_batch, max_queue=10000, batch_size=200, flush_interval=1.0,
+                 maintenance=None, maintenance_interval=3600, name="log-writer"):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.maintenance = maintenance
+        self.maintenance_interval = maintenance_interval
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._counters = {"submitted": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+        self._high_water = 0
+        self._last_error = None
+        self._last_maintenance = time.monotonic()
+
+    def ensure_started(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def submit(self, row):
+        """Queue a row for writing; returns False if it was dropped because the queue is full."""
+        self.ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self._counters["dropped"] += 1
+            return False
+        with self._lock:
+            self._counters["submitted"] += 1
+            self._high_water = max(self._high_water, self._queue.qsize())
+        return True
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far has been written (or failed)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "queue_high_water": self._high_water,
+                "last_error": self._last_error,
+            }
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self.write_batch(batch)
+                    with self._lock:
+                        self._counters["written"] += len(batch)
+                        self._counters["batches"] += 1
+                except Exception as e:
+                    with self._lock:
+                        self._counters["failed"] += len(batch)
+                        self._last_error = str(e)
+                    print(f"Failed to write {len(batch)} {self.name} rows: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+            if self.maintenance and time.monotonic() - self._last_maintenance >= self.maintenance_interval:
+                self._last_maintenance = time.monotonic()
+                try:
+                    self.maintenance()
+                except Exception as e:
+                    print(f"{self.name} maintenance failed: {e}")
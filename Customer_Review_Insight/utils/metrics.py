@@ -0,0 +1,117 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict, deque
+from utils.batching import percentile
+
+# Prometheus-style cumulative bucket bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _EndpointStats:
+    def __init__(self, window):
+        self.requests = defaultdict(int)          # (method, status) -> count
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.recent = deque(maxlen=window)
+        self.db_statements = 0
+        self.max_db_statements = 0
+        self.in_flight = 0
+
+class RequestMetrics:
+    """
+    In-memory per-endpoint request telemetry: counts by method and status,
+    a latency histogram plus p50/p95/p99 over the last `window` requests,
+    in-flight gauges and DB statements issued. Rendered as Prometheus text
+    by `render_prometheus()`.
+    """
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, endpoint):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats(self.window)
+        return stats
+
+    def started(self, endpoint):
+        with self._lock:
+            self._stats(endpoint).in_flight += 1
+
+    def finished(self, endpoint, method, status, seconds, db_statements):
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.in_flight -= 1
+            stats.requests[(method, str(status))] += 1
+            stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            stats.latency_sum += seconds
+            stats.latency_count += 1
+            stats.recent.append(seconds)
+            stats.db_statements += db_statements
+            stats.max_db_statements = max(stats.max_db_statements, db_statements)
+
+    def summary(self):
+        """Per-endpoint rows, slowest p95 first, with latencies in milliseconds."""
+        rows = []
+        with self._lock:
+            for endpoint, stats in self._endpoints.items():
+                recent = sorted(stats.recent)
+                count = stats.latency_count
+                rows.append({
+                    "endpoint": endpoint,
+                    "requests": count,
+                    "in_flight": stats.in_flight,
+                    "errors": sum(n for (_, status), n in stats.requests.items() if status.startswith("5")),
+                    **{
+                        f"p{pct}_ms": round(percentile(recent, pct) * 1000, 1) if recent else None
+                        for pct in (50, 95, 99)
+                    },
+                    "mean_db_statements": round(stats.db_statements / count, 1) if count else 0,
+                    "max_db_statements": stats.max_db_statements,
+                })
+        return sorted(rows, key=lambda row: row["p95_ms"] or 0, reverse=True)
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            lines += ["# HELP http_requests_total Requests handled, by endpoint, method and status.",
+                      "# TYPE http_requests_total counter"]
+            for endpoint, stats in endpoints:
+                for (method, status), n in sorted(stats.requests.items()):
+                    lines.append(f'http_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {n}')
+
+            lines += ["# HELP http_request_duration_seconds Request latency.",
+                      "# TYPE http_request_duration_seconds histogram"]
+            for endpoint, stats in endpoints:
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    cumulative += n
+                    lines.append(f'http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {stats.latency_sum:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{endpoint="{endpoint}"}} {stats.latency_count}')
+
+            lines += ["# HELP http_request_duration_quantile_seconds Latency quantiles over recent requests.",
+                      "# TYPE http_request_duration_quantile_seconds gauge"]
+            for endpoint, stats in endpoints:
+                recent = sorted(stats.recent)
+                for pct in (50, 95, 99):
+                    if recent:
+                        lines.append(
+                            f'http_request_duration_quantile_seconds{{endpoint="{endpoint}",quantile="{pct / 100}"}} '
+                            f'{percentile(recent, pct):.6f}'
+                        )
+
+            lines += ["# HELP http_requests_in_flight Requests currently being handled.",
+                      "# TYPE http_requests_in_flight gauge"]
+            for endpoint, stats in endpoints:
+                lines.append(f'http_requests_in_flight{{endpoint="{endpoint}"}} {stats.in_flight}')
+
+            lines += ["# HELP http_request_db_statements_total SQL statements issued while handling requests.",
+                      "# TYPE http_request_db_statements_total counter"]
+            for endpoint, stats in endpoints:
+                lines.append(f'http_request_db_statements_total{{endpoint="{endpoint}"}} {stats.db_statements}')
+        return "\n".join(lines) + "\n"
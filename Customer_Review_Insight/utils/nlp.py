@@ -0,0 +1,25 @@
+import os
+from utils.lazy import LazyLoader
+
+def _load_spacy():
+    import spacy
+    return spacy.load("en_core_web_sm")
+
+# Single spaCy model shared by cleaning, aspect extraction and sentence
+# splitting, so each review is parsed into exactly one Doc. Loaded on first
+# use so DB/CLI commands that never touch text don't pay for it.
+_nlp = LazyLoader(_load_spacy)
+
+PIPE_BATCH_SIZE = int(os.environ.get("NLP_BATCH_SIZE", 64))
+PIPE_PROCESSES = int(os.environ.get("NLP_PROCESSES", 1))
+
+def get_nlp():
+    return _nlp.get()
+
+def parse(text: str):
+    """Parse one text into a spaCy Doc."""
+    return get_nlp()(text)
+
+def parse_many(texts, batch_size: int = PIPE_BATCH_SIZE, n_process: int = PIPE_PROCESSES):
+    """Parse many texts with nlp.pipe; returns a list of Docs in input order."""
+    return list(get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process))
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+class ReportCache:
+    """
+    Rendered report files on disk, one per (report, scope, data version).
+    When the data changes the new version is written alongside and older
+    versions of the same report are dropped; evict() also removes files
+    older than `max_age` seconds and trims the directory to `max_bytes`,
+    oldest first.
+    """
+
+    def __init__(self, directory, max_age=7 * 24 * 3600, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, report, scope, version, ext):
+        return os.path.join(self.directory, f"{report}-{scope}-{version}.{ext}")
+
+    def get(self, report, scope, version, ext):
+        """Path of the cached file, or None if this version hasn't been rendered."""
+        path = self._path(report, scope, version, ext)
+        return path if os.path.exists(path) else None
+
+    def put(self, report, scope, version, ext, data: bytes):
+        """Store a rendered report atomically and return its path."""
+        path = self._path(report, scope, version, ext)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        prefix, suffix = f"{report}-{scope}-", f".{ext}"
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.startswith(prefix) and name.endswith(suffix) and os.path.join(self.directory, name) != path:
+                    self._remove(os.path.join(self.directory, name))
+        return path
+
+    def evict(self):
+        """Drop files past max_age, then the oldest until the total fits max_bytes."""
+        with self._lock:
+            now = time.time()
+            files = []
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.max_age:
+                    self._remove(path)
+                else:
+                    files.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
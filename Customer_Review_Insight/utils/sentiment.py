@@ -1,17 +1,203 @@
-from transformers import pipeline
+import os
+import json
+import urllib.request
+from utils.batching import MicroBatcher
+from utils.inference_cache import InferenceCache, cache_key
+from utils.lazy import LazyLoader
 
 # Cardiff NLP model gives 3-class output (neg, neu, pos)
 MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
-sentiment_pipeline = pipeline("sentiment-analysis", model=MODEL_NAME)
+DEFAULT_BATCH_SIZE = 32
+
+# --- Inference backends ---
+# pytorch:   full-precision model (reference)
+# quantized: dynamic int8 quantization of the Linear layers, CPU only
+# onnx:      ONNX Runtime export via the optional `optimum[onnxruntime]` package
+ONNX_MODEL_DIR = os.environ.get(
+    "SENTIMENT_ONNX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instance", "onnx_sentiment")
+)
+
+def _load_pytorch():
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=MODEL_NAME)
+
+def _load_quantized():
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("sentiment-analysis", model=model, tokenizer=AutoTokenizer.from_pretrained(MODEL_NAME))
+
+def _load_onnx():
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError:
+        raise RuntimeError("The onnx sentiment backend needs `pip install optimum[onnxruntime]`.")
+    from transformers import AutoTokenizer, pipeline
+    # Export once and reuse the saved graph on later starts
+    if os.path.isdir(ONNX_MODEL_DIR):
+        model = ORTModelForSequenceClassification.from_pretrained(ONNX_MODEL_DIR)
+        tokenizer = AutoTokenizer.from_pretrained(ONNX_MODEL_DIR)
+    else:
+        model = ORTModelForSequenceClassification.from_pretrained(MODEL_NAME, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        model.save_pretrained(ONNX_MODEL_DIR)
+        tokenizer.save_pretrained(ONNX_MODEL_DIR)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+BACKENDS = {
+    "pytorch": _load_pytorch,
+    "quantized": _load_quantized,
+    "onnx": _load_onnx,
+}
+
+def load_backend(name: str):
+    """Build the pipeline for one backend; used directly by bench_sentiment.py."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend {name!r}; expected one of {', '.join(BACKENDS)}.")
+    return BACKENDS[name]()
+
+SENTIMENT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "pytorch")
+if SENTIMENT_BACKEND not in BACKENDS:
+    raise ValueError(f"Unknown SENTIMENT_BACKEND {SENTIMENT_BACKEND!r}; expected one of {', '.join(BACKENDS)}.")
+
+# Stored alongside persisted results so they can be told apart after a model
+# or backend change (quantized/ONNX scores differ slightly from full precision)
+MODEL_VERSION = MODEL_NAME if SENTIMENT_BACKEND == "pytorch" else f"{MODEL_NAME}+{SENTIMENT_BACKEND}"
+
+# Built on first use: importing this module must stay cheap for DB/CLI commands
+_sentiment_pipeline = LazyLoader(lambda: load_backend(SENTIMENT_BACKEND))
+
+def get_sentiment_pipeline():
+    return _sentiment_pipeline.get()
+
+# When set (e.g. http://127.0.0.1:8765), scoring is delegated to
+# inference_server.py and this process never loads the model
+INFERENCE_SERVER_URL = os.environ.get("INFERENCE_SERVER_URL", "").rstrip("/")
+INFERENCE_SERVER_TIMEOUT = float(os.environ.get("INFERENCE_SERVER_TIMEOUT", 30))
+
+# Results are cached by content hash, so repeated reviews skip inference
+INFERENCE_CACHE_PATH = os.environ.get(
+    "INFERENCE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instance", "inference_cache.db")
+)
+inference_cache = InferenceCache(
+    INFERENCE_CACHE_PATH,
+    max_memory_items=int(os.environ.get("INFERENCE_CACHE_MEMORY_ITEMS", 10000)),
+    max_disk_items=int(os.environ.get("INFERENCE_CACHE_DISK_ITEMS", 500000))
+)
+
+# Cardiff model uses LABEL_0/1/2, so remap:
+LABEL_MAPPING = {"LABEL_0": "negative", "LABEL_1": "neutral", "LABEL_2": "positive"}
+
+def to_result(raw):
+    """Map one raw pipeline output to the {label, score} contract."""
+    label = raw["label"]
+    if label.startswith("LABEL_"):
+        label = LABEL_MAPPING[label]
+    return {"label": label, "score": float(raw["score"])}
+
+def score_texts(texts, batch_size: int = DEFAULT_BATCH_SIZE):
+    """Run the local pipeline on texts (no cache) and return {label, score} dicts."""
+    outputs = get_sentiment_pipeline()(list(texts), batch_size=batch_size, truncation=True)
+    return [to_result(raw) for raw in outputs]
+
+def _remote_score(texts):
+    request = urllib.request.Request(
+        INFERENCE_SERVER_URL + "/sentiment",
+        data=json.dumps({"texts": texts}).encode("utf-8"),
+        headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=INFERENCE_SERVER_TIMEOUT) as response:
+        payload = json.load(response)
+    # Cached/stored results are keyed by MODEL_VERSION, so both sides must agree on it
+    if payload["model_version"] != MODEL_VERSION:
+        raise RuntimeError(
+            f"Inference server runs {payload['model_version']!r} but this process expects {MODEL_VERSION!r}; "
+            "set the same SENTIMENT_BACKEND on both."
+        )
+    return payload["results"]
+
+def warm_up():
+    """Load the model (or check the inference server is reachable) before traffic arrives."""
+    if INFERENCE_SERVER_URL:
+        with urllib.request.urlopen(INFERENCE_SERVER_URL + "/health", timeout=INFERENCE_SERVER_TIMEOUT):
+            return
+    score_texts(["Warm-up."])
 
 def analyze_sentiment(text: str):
     """
     Run Hugging Face sentiment model on text and return a dict {label, score}.
+    Concurrent single calls (e.g. review submissions) are coalesced into one
+    batched forward pass by the micro-batcher; cache hits skip the wait.
     """
-    result = sentiment_pipeline(text, truncation=True)[0]
-    label = result["label"]
-    # Cardiff model uses LABEL_0/1/2, so remap:
-    if label.startswith("LABEL_"):
-        mapping = {"LABEL_0": "negative", "LABEL_1": "neutral", "LABEL_2": "positive"}
-        label = mapping[label]
-    return {"label": label, "score": float(result["score"])}
+    if SINGLE_BATCH_MAX_DELAY <= 0:
+        return analyze_sentiment_batch([text])[0]
+    key = cache_key(text, MODEL_VERSION)
+    cached = inference_cache.get_many([key])[0]
+    if cached is not None:
+        return cached
+    return _single_batcher.get().submit((key, text)).result()
+
+def analyze_sentiment_batch(texts, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Score many texts in padded tensor batches and return one {label, score}
+    dict per input, in input order. Cached results are reused and each
+    distinct uncached text is scored once. Inputs are sorted by length first
+    so each batch holds similarly sized reviews and little compute is spent
+    on padding.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    keys = [cache_key(text, MODEL_VERSION) for text in texts]
+    results = inference_cache.get_many(keys)
+
+    pending = {}
+    for i, result in enumerate(results):
+        if result is None:
+            pending.setdefault(keys[i], i)
+    if pending:
+        scored = _score_and_cache([(keys[i], texts[i]) for i in pending.values()], batch_size)
+        results = [result if result is not None else scored[key] for key, result in zip(keys, results)]
+    return results
+
+def _score_and_cache(items, batch_size: int = DEFAULT_BATCH_SIZE):
+    """Score distinct (cache key, text) pairs, store them and return {key: result}."""
+    items = sorted(dict(items).items(), key=lambda item: len(item[1]))
+    texts = [text for _, text in items]
+    outputs = _remote_score(texts) if INFERENCE_SERVER_URL else score_texts(texts, batch_size)
+    scored = {key: result for (key, _), result in zip(items, outputs)}
+    inference_cache.put_many(list(scored.items()))
+    return scored
+
+# --- Micro-batching of single calls ---
+# Single-text calls wait up to this long for company before running (0 disables)
+SINGLE_BATCH_MAX_DELAY = float(os.environ.get("SENTIMENT_BATCH_MAX_DELAY_MS", 5)) / 1000
+SINGLE_BATCH_MAX_SIZE = int(os.environ.get("SENTIMENT_BATCH_MAX_SIZE", DEFAULT_BATCH_SIZE))
+
+def _score_batched(items):
+    scored = _score_and_cache(items)
+    return [scored[key] for key, _ in items]
+
+_single_batcher = LazyLoader(lambda: MicroBatcher(
+    _score_batched,
+    max_batch_size=SINGLE_BATCH_MAX_SIZE,
+    max_delay=SINGLE_BATCH_MAX_DELAY,
+    name="sentiment-batcher"
+))
+
+def inference_queue_depth():
+    """Single-text calls waiting for the micro-batcher (0 until it has been used)."""
+    if SINGLE_BATCH_MAX_DELAY <= 0 or not _single_batcher.loaded:
+        return 0
+    return _single_batcher.get().queue_depth()
+
+def batching_stats():
+    if SINGLE_BATCH_MAX_DELAY <= 0:
+        return {"enabled": False}
+    return {"enabled": True, **_single_batcher.get().stats()}
+
+def inference_cache_stats():
+    return inference_cache.stats()
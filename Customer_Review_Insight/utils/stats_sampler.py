@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+import psutil
+
+class StatsSampler:
+    """
+    Background thread that records host and process stats every `interval`
+    seconds into a ring buffer of the last `history` points, so monitoring
+    requests read a snapshot instead of measuring (cpu_percent is sampled
+    non-blocking, as the delta since the previous point). `probes` maps
+    extra field names to zero-argument callables.
+    """
+
+    def __init__(self, interval=5.0, history=720, probes=None, disk_path="/"):
+        self.interval = interval
+        self.probes = dict(probes or {})
+        self.disk_path = disk_path
+        # (time.monotonic(), point) pairs, so windows survive clock changes and gaps
+        self._points = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._process = psutil.Process()
+
+    def ensure_started(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            # Prime the CPU counters so the first real sample covers one interval
+            psutil.cpu_percent(interval=None)
+            self._process.cpu_percent(interval=None)
+            self._thread = threading.Thread(target=self._run, name="stats-sampler", daemon=True)
+            self._thread.start()
+
+    def sample(self):
+        """
+        Take one point now and append it to the history. Only the sampler
+        thread calls this: the CPU readings are deltas since its last call.
+        """
+        memory = psutil.virtual_memory()
+        point = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "cpu_usage_percent": psutil.cpu_percent(interval=None),
+            "memory_usage_percent": memory.percent,
+            "disk_usage_percent": psutil.disk_usage(self.disk_path).percent,
+            "process_rss_mb": round(self._process.memory_info().rss / 2**20, 1),
+            "process_cpu_percent": self._process.cpu_percent(interval=None),
+        }
+        for name, probe in self.probes.items():
+            try:
+                point[name] = probe()
+            except Exception:
+                point[name] = None
+        with self._lock:
+            self._points.append((time.monotonic(), point))
+        return point
+
+    def latest(self):
+        """The newest point, or None until the first interval has elapsed."""
+        with self._lock:
+            return self._points[-1][1] if self._points else None
+
+    def window(self, seconds):
+        """Points taken in the last `seconds` seconds, oldest first."""
+        cutoff = time.monotonic() - seconds
+        with self._lock:
+            return [point for taken, point in self._points if taken >= cutoff]
+
+    def _run(self):
+        # Wait before the first point too, so each one covers a full interval since priming
+        started = time.monotonic()
+        while True:
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+            started = time.monotonic()
+            self.sample()
+
+def file_size_mb(*paths):
+    """Combined size of the files that exist (e.g. a SQLite DB plus its -wal)."""
+    return round(sum(os.path.getsize(p) for p in paths if os.path.exists(p)) / 2**20, 2)
@@ -1,23 +1,29 @@
 import re
-import spacy
-from nltk.corpus import stopwords
+from functools import lru_cache
+from utils.nlp import parse
 
-# load spacy model once
-nlp = spacy.load("en_core_web_sm")
-NLTK_STOPS = set(stopwords.words("english"))
+@lru_cache(maxsize=1)
+def nltk_stops():
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words("english"))
 
-def clean_and_tokenize(text: str):
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    doc = nlp(text)
-    return [
-        token.lemma_ for token in doc
-        if token.lemma_ not in NLTK_STOPS
-        and not token.is_punct
-        and token.lemma_.strip()
-    ]
+def clean_and_tokenize(text: str, doc=None):
+    """
+    Lowercased lemmas with stopwords, punctuation and non-alphanumeric
+    characters removed. Pass an already parsed `doc` to reuse it.
+    """
+    if doc is None:
+        doc = parse(text)
+    stops = nltk_stops()
+    lemmas = []
+    for token in doc:
+        if token.is_punct or token.is_space:
+            continue
+        for lemma in re.sub(r"[^a-z0-9\s]", " ", token.lemma_.lower()).split():
+            if lemma not in stops:
+                lemmas.append(lemma)
+    return lemmas
 
-def cleaned_string(text: str):
+def cleaned_string(text: str, doc=None):
     """Returns a single cleaned string (lemmas, stopwords removed)."""
-    return " ".join(clean_and_tokenize(text))
+    return " ".join(clean_and_tokenize(text, doc))